@@ -0,0 +1,325 @@
+# benchmark.py
+#
+# Micro-benchmarks for the rendering hot paths. Runs against SDL's dummy video
+# driver, so no window is opened:
+#
+#     python benchmark.py            # run everything
+#     python benchmark.py ships      # run one benchmark by name
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import random
+import time
+import pygame
+from constants import *
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Registers a benchmark function under `name`."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def time_per_call(func, repeat):
+    """Returns the mean wall time of `func()` in milliseconds over `repeat` calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000.0 / repeat
+
+def report(label, ms):
+    print(f"  {label:<40} {ms:9.4f} ms")
+
+@benchmark("ships")
+def bench_ships(screen, repeat):
+    """Ship sprite bake cost versus cached enemy ship drawing."""
+    from spaceship import SPACESHIP_SHAPES, SHIP_SPRITE_CACHE, render_spaceship, draw_spaceship
+
+    shapes = list(SPACESHIP_SHAPES.values())
+    colors = [(random.randint(55, 255), random.randint(55, 255), random.randint(55, 255)) for _ in range(16)]
+    ships = [(random.choice(shapes), random.uniform(0.5, 1.5), random.choice(colors),
+              (random.uniform(0, WIDTH), random.uniform(0, HEIGHT))) for _ in range(64)]
+
+    def bake():
+        for matrix, scale, color, _ in ships:
+            render_spaceship(matrix, scale, color)
+
+    def draw_uncached():
+        for matrix, scale, color, position in ships:
+            screen.blit(render_spaceship(matrix, scale, color), position)
+
+    def draw_cached():
+        for matrix, scale, color, position in ships:
+            draw_spaceship(screen, matrix, position, scale, color)
+
+    SHIP_SPRITE_CACHE.clear()
+    report("bake 64 ship sprites", time_per_call(bake, repeat))
+    report("draw 64 ships, baked per frame", time_per_call(draw_uncached, repeat))
+    draw_cached()
+    report("draw 64 ships, sprite cache", time_per_call(draw_cached, repeat))
+    print(f"  cache: {SHIP_SPRITE_CACHE.stats()}")
+
+@benchmark("rotation")
+def bench_rotation(screen, repeat):
+    """Rotated ship drawing: rebuild + rotate per call versus ROTATED_SHIP_CACHE."""
+    import constants
+    import ship_rotation
+
+    shapes = list(constants.SPACESHIP_SHAPES.values())
+    ships = [(random.choice(shapes), random.uniform(0, 360),
+              (random.uniform(0, WIDTH), random.uniform(0, HEIGHT))) for _ in range(64)]
+
+    def draw_uncached():
+        for matrix, angle, position in ships:
+            rotated = pygame.transform.rotate(ship_rotation.render_ship_surface(matrix), -angle + 180)
+            screen.blit(rotated, rotated.get_rect(center=position).topleft)
+
+    def draw_cached():
+        for matrix, angle, position in ships:
+            ship_rotation.draw_spaceship(screen, matrix, position, rotation=angle)
+
+    ship_rotation.ROTATED_SHIP_CACHE.clear()
+    report("warm rotation cache (24 shapes x 72)", time_per_call(
+        lambda: ship_rotation.warm_rotation_cache(shapes), 1))
+    report("draw 64 rotated ships, uncached", time_per_call(draw_uncached, repeat))
+    report("draw 64 rotated ships, rotation cache", time_per_call(draw_cached, repeat))
+
+@benchmark("flame")
+def bench_flame(screen, repeat):
+    """Ship flame: procedural segments versus FlameRenderer, while accelerating and at steady speed."""
+    import flame
+    from pygame.math import Vector2
+
+    center = Vector2(WIDTH // 2, HEIGHT // 2)
+    directions = list(DIRECTION_VECTORS)
+
+    def frames(accelerating, count=600):
+        # (direction, length, time) per drawn frame; a new direction every 1.5 s
+        sequence = []
+        length = 0
+        for i in range(count):
+            if i % 90 == 0:
+                direction = random.choice(directions)
+                length = 0
+            length = min(length + 2.5, 320) if accelerating else 200
+            sequence.append((direction, length, i * 1000 / 60))
+        return sequence
+
+    def procedural(sequence):
+        for direction, length, ticks in sequence:
+            dir_vector = Vector2(DIRECTION_VECTORS[direction]).normalize()
+            flame.draw_flame_segments(screen, center - dir_vector * 5, -dir_vector, length,
+                                      ticks * flame.FLAME_WAVE_SPEED)
+
+    def rendered(sequence):
+        renderer = flame.FlameRenderer()
+        for direction, length, ticks in sequence:
+            dir_vector = Vector2(DIRECTION_VECTORS[direction]).normalize()
+            renderer.draw(screen, direction, length, ticks, center - dir_vector * 5)
+
+    for label, accelerating in (("accelerating", True), ("steady speed", False)):
+        sequence = frames(accelerating)
+        flame.FLAME_FRAME_CACHE.clear()
+        report(f"flame {label}, procedural", time_per_call(lambda: procedural(sequence), 1) / len(sequence))
+        report(f"flame {label}, renderer (cold)", time_per_call(lambda: rendered(sequence), 1) / len(sequence))
+        report(f"flame {label}, renderer (warm)", time_per_call(lambda: rendered(sequence), 1) / len(sequence))
+    print(f"  cache: {flame.FLAME_FRAME_CACHE.stats()}")
+
+def legacy_world_pass(game, batch):
+    """The pre-render-queue world pass: a dict per object, one sort, two full draws."""
+    game.starfield.partition(game.stars, keep=game.target_star)
+    player_depth = game.player.depth
+    world_objects = []
+    for star in game.starfield.near_stars:
+        world_objects.append({'depth': star.depth, 'object': star, 'type': 'star',
+                              'is_target': star == game.target_star})
+    for enemy in game.enemies:
+        world_objects.append({'depth': enemy.depth - player_depth, 'object': enemy, 'type': 'enemy'})
+    far_bullets = []
+    for bullet in game.bullets:
+        if bullet.depth > player_depth:
+            far_bullets.append({'depth': bullet.depth, 'object': bullet, 'type': 'bullet'})
+    world_objects.sort(key=lambda x: x['depth'])
+    for obj_info in world_objects:
+        obj_info['object'].emit(batch)
+    batch.flush(game.screen)
+    far_bullets.sort(key=lambda x: x['depth'])
+    for obj_info in reversed(far_bullets):
+        obj_info['object'].emit(batch)
+    batch.flush(game.screen)
+    for obj_info in reversed(world_objects):
+        obj_info['object'].emit(batch)
+    batch.flush(game.screen)
+
+def queued_world_pass(game, batch, queue):
+    """The same world objects through a RenderQueue: one sort, one draw."""
+    game.starfield.partition(game.stars, keep=game.target_star)
+    player_depth = game.player.depth
+    for star in game.starfield.near_stars:
+        queue.push(star.depth, star)
+    for enemy in game.enemies:
+        queue.push(enemy.depth - player_depth, enemy)
+    for bullet in game.bullets:
+        if bullet.depth > player_depth:
+            queue.push(bullet.depth - player_depth, bullet)
+    queue.emit(batch)
+    batch.flush(game.screen)
+
+def indexed_world_pass(game, batch):
+    """The world objects through Game.depth_index: repaired, never re-sorted."""
+    game.starfield.partition(game.stars, keep=game.target_star)
+    game.depth_index.repair(game.player.depth)
+    game.depth_index.emit(batch)
+    batch.flush(game.screen)
+
+def drift_depths(game, amount=0.01):
+    """Moves every star and enemy in depth the way a frame of zooming does, wrapping stars."""
+    for star in game.stars:
+        star.depth += amount
+        star._handle_wrapping(invert_x=False, invert_y=False)
+    for enemy in game.enemies:
+        enemy.depth += amount * random.uniform(0.9, 1.1)
+
+@benchmark("scene")
+def bench_scene(screen, repeat):
+    """World pass of draw_scene: legacy two-pass dict path, render queue, depth index."""
+    from game import Game
+    from render_queue import RenderQueue
+    from sprite_batch import SpriteBatch
+
+    game = Game()
+    batch = SpriteBatch()  # No light buffer: the legacy passes draw alpha glow
+    queue = RenderQueue()
+
+    def drifting(world_pass):
+        def frame():
+            drift_depths(game)
+            world_pass()
+        return frame
+
+    stars = len(game.stars)
+    report(f"legacy world pass ({stars} stars)", time_per_call(drifting(lambda: legacy_world_pass(game, batch)), repeat))
+    report("render queue world pass", time_per_call(drifting(lambda: queued_world_pass(game, batch, queue)), repeat))
+    report("depth index world pass", time_per_call(drifting(lambda: indexed_world_pass(game, batch)), repeat))
+    report("full draw_scene", time_per_call(drifting(game.draw_scene), repeat))
+    print(f"  depth index: {game.depth_index.moves} moves, {game.depth_index.resorts} full sorts")
+    print(f"  culling (last frame): {game.culler.stats()}")
+
+@benchmark("lights")
+def bench_lights(screen, repeat):
+    """Star glow as alpha sprites versus additive light sprites in the same batch."""
+    from star import Star
+    from sprite_batch import SpriteBatch
+
+    for count in (64, 512, 2048):
+        stars = [Star(random.uniform(0, WIDTH), random.uniform(0, HEIGHT), random.uniform(MIN_DEPTH, STAR_LOD_GLOW_DEPTH))
+                 for _ in range(count)]
+        alpha_batch = SpriteBatch()
+        light_batch = SpriteBatch()
+        light_batch.additive_glow = True
+
+        def alpha_glow():
+            for star in stars:
+                star.emit(alpha_batch)
+            alpha_batch.flush(screen)
+
+        def light_glow():
+            for star in stars:
+                star.emit(light_batch)
+            light_batch.flush(screen)
+
+        alpha_glow()
+        light_glow()
+        report(f"{count} glowing stars, alpha sprites", time_per_call(alpha_glow, repeat))
+        report(f"{count} glowing stars, additive glow", time_per_call(light_glow, repeat))
+
+    from game import Game
+    for additive_glow in (False, True):
+        game = Game(additive_glow=additive_glow)
+        game.draw_scene()
+        report(f"full draw_scene, additive_glow={additive_glow}", time_per_call(game.draw_scene, repeat))
+
+@benchmark("trails")
+def bench_trails(screen, repeat):
+    """TrailBuffer frame cost (fade, composite, stamps); independent of trail length."""
+    from star import Star
+    from sprite_batch import SpriteBatch
+    from trails import TrailBuffer
+
+    for count in (64, 512):
+        stars = [Star(random.uniform(0, WIDTH), random.uniform(0, HEIGHT), random.uniform(MIN_DEPTH, MAX_DEPTH))
+                 for _ in range(count)]
+        for star in stars:
+            star.trail = True
+        batch = SpriteBatch()
+        batch.trails = TrailBuffer(screen, (WIDTH, HEIGHT))
+
+        def frame():
+            batch.trails.composite(screen)
+            for star in stars:
+                star.position.x = (star.position.x + 7) % WIDTH
+                star.emit(batch)
+            batch.flush(screen)
+            batch.trails.flush()
+
+        for _ in range(batch.trails.regions.maxlen):
+            frame()  # Fill the buffer to a steady state
+        report(f"{count} stars with trails", time_per_call(frame, repeat))
+
+@benchmark("tiles")
+def bench_tiles(screen, repeat):
+    """One large sprite batch flushed on the main thread versus split into tiles on a thread pool."""
+    from star import Star
+    from sprite_batch import SpriteBatch
+    from tile_render import TileRenderer
+
+    stars = [Star(random.uniform(0, WIDTH), random.uniform(0, HEIGHT), random.uniform(MIN_DEPTH, STAR_LOD_GLOW_DEPTH))
+             for _ in range(2048)]
+    batch = SpriteBatch()
+
+    def emit():
+        for star in stars:
+            star.emit(batch)
+
+    def serial():
+        emit()
+        batch.flush(screen)
+
+    report(f"{len(stars)} stars, emit only", time_per_call(lambda: (emit(), batch.clear()), repeat))
+    serial()
+    report(f"{len(stars)} stars, main thread", time_per_call(serial, repeat))
+    print(f"  {os.cpu_count()} cpus")
+    for count in (2, 4, 8):
+        tiles = TileRenderer(screen, count)
+
+        def tiled():
+            emit()
+            tiles.flush(batch)
+
+        tiled()
+        report(f"{len(stars)} stars, {count} tiles", time_per_call(tiled, repeat))
+        copies = sum(tile.sprite_bytes for tile in tiles.tiles)
+        print(f"  {count} tiles: {copies / 1024:.0f} KiB of sprite copies")
+        tiles.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse Vector rendering benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=200, help="calls per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    for name in args.names or list(BENCHMARKS):
+        print(f"{name}:")
+        BENCHMARKS[name](screen, args.repeat)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
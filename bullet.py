@@ -3,9 +3,21 @@ from pygame.math import Vector2
 import math
 from constants import *
 from player import *
+from sprite_cache import SpriteCache, finalize_sprite
+from sim_clock import WALL_CLOCK
+from lighting import light_sprite
 
 # A new constant for how close in depth the bullet needs to be to its target
 BULLET_DEPTH_HIT_TOLERANCE = .25  # Tweak as needed
+BULLET_LIGHT_RADIUS = 4  # Glow radius in bullet radii when drawing additive glow
+
+BULLET_SPRITE_CACHE = SpriteCache(512, name="bullet")
+
+def build_bullet_sprite(color, radius):
+    """Renders a filled bullet circle of the given radius centered in a (2r, 2r) sprite."""
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (radius, radius), radius)
+    return finalize_sprite(sprite)
 
 class Bullet:
     def __init__(
@@ -17,8 +29,10 @@ class Bullet:
         spaceship_height,
         player_velocity=Vector2(0, 0),
         player_depth=1.0,
-        is_enemy_bullet=False
+        is_enemy_bullet=False,
+        clock=WALL_CLOCK
     ):
+        self.clock = clock  # SimClock of the game; lifespan is measured on it
         self.position = Vector2(position)
         self.direction = direction
         self.initial_depth = initial_depth
@@ -56,7 +70,7 @@ class Bullet:
         else:
             self.base_size = 1  # Default size if depth is zero
 
-        self.creation_time = pygame.time.get_ticks()
+        self.creation_time = clock.ticks
         self.alive = True
         self.total_depth_change = 2.0
         self.color = (255, 0, 0)  # Default to red
@@ -64,6 +78,11 @@ class Bullet:
             self.color = (0, 255, 255)  # Cyan for player bullets
         self.size = self.base_size
         self.lifespan = 3333
+        self.type = "bullet"
+        self.trail = BULLET_TRAILS  # Stamp into the game's TrailBuffer
+        self.batched = True  # Cleared by draw_scene while the bullet is in front of the player
+        self.depth_listener = None
+        self.previous_state = (self.position.x, self.position.y, self.depth)  # Collisions sweep from here
         
     def get_collision_radius(self):
         # Return bullet's on-screen radius
@@ -127,15 +146,36 @@ class Bullet:
             self.color = (r, g, b)
 
         # Remove bullet if off-screen, if it exceeds depth boundaries, or if it exceeds its lifespan
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.ticks
         if (self.position.x < 0 or self.position.x > WIDTH or
                 self.position.y < 0 or self.position.y > HEIGHT or
                 self.depth < MIN_DEPTH or self.depth > BULLET_MAX_DEPTH or
                 current_time - self.creation_time > self.lifespan):
             self.alive = False
 
-    def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.position.x), int(self.position.y)), self.size)
+    def screen_bounds(self):
+        """Screen rect of the bullet sprite."""
+        radius = self.size
+        return pygame.Rect(int(self.position.x) - radius, int(self.position.y) - radius, radius * 2, radius * 2)
+
+    def emit(self, batch):
+        """
+        Queues the bullet's cached circle sprite into a sprite batch, plus an additive
+        glow light when the batch has `additive_glow` set and a trail stamp when `trail` is set.
+
+        Args:
+            batch (SpriteBatch): Batch collecting this frame's blits.
+        """
+        radius = self.size
+        color = self.color
+        sprite = BULLET_SPRITE_CACHE.get((color, radius), lambda: build_bullet_sprite(color, radius))
+        dest = (int(self.position.x) - radius, int(self.position.y) - radius)
+        batch.add(sprite, dest)
+        if self.trail and batch.trails is not None:
+            batch.trails.stamp(sprite, dest)
+        if batch.additive_glow:
+            light, center = light_sprite(color, radius * BULLET_LIGHT_RADIUS)
+            batch.add(light, (int(self.position.x) - center, int(self.position.y) - center), None, pygame.BLEND_RGB_ADD)
         
         '''
         debug_font = pygame.font.SysFont(None, 16)
@@ -157,7 +197,14 @@ class Bullet:
 
     def check_collision(self, target):
         """
-        Check collision with a target based on 2D overlap and depth tolerance.
+        Check collision with a target over the last simulation step.
+
+        Bullet and target are swept linearly from their pre-step state
+        (`previous_state`) to where they are now, so fast bullets and long steps
+        cannot tunnel through a target: it is a hit if, at some moment of the step,
+        the circles overlap in 2D while the interpolated depths are within
+        BULLET_DEPTH_HIT_TOLERANCE. This is the one-pair case of
+        collision.swept_hits, which the game uses to test every pair at once.
 
         Args:
             target (Player or Enemy): The target to check collision against.
@@ -165,25 +212,15 @@ class Bullet:
         Returns:
             bool: True if collision occurs, False otherwise.
         """
-        # Depth tolerance check
-        if hasattr(target, 'depth'):
-            if abs(self.depth - target.depth) > BULLET_DEPTH_HIT_TOLERANCE:
-                return False
-
         # Ensure target has necessary attributes
         if not hasattr(target, 'position') or not hasattr(target, '_get_onscreen_radius'):
             return False
         
-        bullet_radius = self._get_onscreen_radius()
-        target_radius = target._get_onscreen_radius()
+        from collision import SweptBodies, swept_hits  # collision imports this module
 
-        # Simple circle-to-circle collision in 2D
         if target.__class__.__name__ == 'Player':  # NEW
-            player_center_position = Vector2(WIDTH // 2, HEIGHT // 2)
-            distance = (self.position - player_center_position).length()
+            # The player stays at the screen center
+            targets = SweptBodies([target], center=(WIDTH // 2, HEIGHT // 2))
         else:
-            distance = (self.position - target.position).length()
-        if distance < (bullet_radius + target_radius):
-            return True
-
-        return False
+            targets = SweptBodies([target])
+        return bool(swept_hits(SweptBodies([self]), targets)[0, 0])
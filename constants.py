@@ -1,7 +1,5 @@
 # constants.py
 
-import pygame
-
 global_depth_change = 0
 DEPTH_COLLISION_TOLERANCE = 0.001
 WIDTH, HEIGHT = 1920, 1080
@@ -13,6 +11,26 @@ MIN_DEPTH = .01
 MAX_DEPTH = 2.0
 BULLET_MAX_DEPTH = 10.0
 STAR_COLOR = (255, 255, 255)
+SIMULATION_RATE = 60  # Fixed simulation steps per second (see timestep.py)
+MAX_SIMULATION_STEPS = 5  # Most simulation steps run per rendered frame; slower frames slow the game down
+FRAME_RATE = 60  # Rendered frames per second cap (0: uncapped)
+SIMULATION_SEED = None  # Seed for the game's random generator (None: a different world every run)
+# Star level of detail: closer than GLOW gets the full glow sprite, closer than POINT
+# a plain core sprite, anything deeper is plotted as a single pixel
+STAR_LOD_GLOW_DEPTH = 1.0
+STAR_LOD_POINT_DEPTH = 1.75
+# Stars deeper than this are baked into cached parallax layers, one per depth band (None disables)
+STAR_BACKGROUND_DEPTH = 1.75
+STAR_BACKGROUND_BANDS = 2
+DIRTY_RECTS = False  # Start with dirty-rectangle display updates (toggle in game with F2)
+RENDER_SCALE = 1.0  # Fraction of WIDTH x HEIGHT the world is rendered at before upscaling (surface backend)
+RENDER_THREADS = 0  # Horizontal tiles drawn in parallel on a thread pool (surface backend; 0 draws on the main thread)
+RENDER_BACKEND = "surface"  # "surface", "texture" or "texture-software" (SDL2 Renderer); see render_backend.py
+# Motion trails through the fading TrailBuffer (trails.py), per object type
+STAR_TRAILS = False
+BULLET_TRAILS = False
+ENEMY_TRAILS = False
+ADDITIVE_GLOW = False  # Draw glow as additive light sprites (BLEND_RGB_ADD) instead of alpha-blended sprites
 TARGET_COLOR = (255, 0, 0)
 # Speed modifiers for bullet types
 NEUTRAL_BULLET_SPEED_MOD = 1  # 50% of the original distance for 2D bullets
@@ -26,50 +44,6 @@ pixel_colors = {
     3: (255, 20, 147),  # NEON_PINK
 }
 
-def draw_spaceship(surface, matrix, position, scale=1.0, color=(255, 255, 255), rotation=0):
-    """
-    Draws a spaceship with one pixel colored cyan, rotated based on the direction.
-
-    Args:
-        surface: Pygame surface to draw on.
-        matrix: 2D list representing the spaceship shape.
-        position: Tuple (x, y) for the spaceship position.
-        scale: Scaling factor for the spaceship size.
-        color: Base color for the spaceship.
-        rotation: Rotation angle in degrees.
-    """
-    # Create a new surface for rotation
-    rows = len(matrix)
-    cols = len(matrix[0]) if rows > 0 else 0
-    ship_width = cols * PIXEL_SIZE * scale
-    ship_height = rows * PIXEL_SIZE * scale
-    ship_surface = pygame.Surface((ship_width, ship_height), pygame.SRCALPHA)
-
-    # Draw the ship on the ship_surface
-    for row_index, row in enumerate(matrix):
-        for col_index, pixel in enumerate(row):
-            if pixel in pixel_colors:
-                color_pixel = pixel_colors[pixel]
-                pygame.draw.rect(
-                    ship_surface,
-                    color_pixel,
-                    (
-                        col_index * PIXEL_SIZE * scale,
-                        row_index * PIXEL_SIZE * scale,
-                        PIXEL_SIZE * scale,
-                        PIXEL_SIZE * scale,
-                    ),
-                )
-
-    # **Rotate the ship_surface by adding 180 degrees to the rotation**
-    rotated_ship = pygame.transform.rotate(ship_surface, -rotation + 180)  # Added 180 degrees
-
-    # Get the new rect and set its center to the desired position
-    rotated_rect = rotated_ship.get_rect(center=position)
-
-    # Blit the rotated ship onto the main surface
-    surface.blit(rotated_ship, rotated_rect.topleft)
-    
 # Updated RAW_SPACESHIP_SHAPES to include multiple colors:
 RAW_SPACESHIP_SHAPES = {
     "up": """
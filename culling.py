@@ -0,0 +1,58 @@
+# culling.py
+
+import pygame
+from constants import *
+
+class Culler:
+    """
+    Screen-space culling stage for world drawables.
+
+    Every object that reaches the world or bullet pass is asked for its
+    `screen_bounds()` (sprite plus glow or health bar) and is only
+    emitted when that rect overlaps the screen. Per-frame counters record how
+    many objects of each type were drawn and culled.
+    """
+
+    def __init__(self, size=(WIDTH, HEIGHT), enabled=True):
+        """
+        Args:
+            size (tuple): Screen size.
+            enabled (bool): When False every object is drawn (counters still run).
+        """
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.enabled = enabled
+        self.drawn = 0
+        self.culled = 0
+        self.by_type = {}  # type -> [drawn, culled] for the current frame
+
+    def begin_frame(self):
+        """Resets the per-frame counters."""
+        self.drawn = 0
+        self.culled = 0
+        self.by_type.clear()
+
+    def visible(self, obj):
+        """
+        True when `obj` overlaps the screen; updates the counters.
+
+        Args:
+            obj: Drawable with `screen_bounds()` and a `type` attribute.
+        """
+        counts = self.by_type.get(obj.type)
+        if counts is None:
+            counts = self.by_type[obj.type] = [0, 0]
+        if not self.enabled or self.screen_rect.colliderect(obj.screen_bounds()):
+            self.drawn += 1
+            counts[0] += 1
+            return True
+        self.culled += 1
+        counts[1] += 1
+        return False
+
+    def stats(self):
+        """Returns the counters of the current frame."""
+        return {
+            "drawn": self.drawn,
+            "culled": self.culled,
+            "by_type": {name: {"drawn": drawn, "culled": culled} for name, (drawn, culled) in self.by_type.items()},
+        }
@@ -0,0 +1,211 @@
+# depth_index.py
+
+from bisect import bisect_left, bisect_right
+from itertools import chain
+import numpy as np
+
+DEPTH_BLOCK_SIZE = 64  # Items per block of the index; blocks split at twice this
+
+class DepthIndex:
+    """
+    Persistent back-to-front ordering of world objects, repaired incrementally.
+
+    Depths only drift a little per frame, so instead of re-sorting every frame
+    the index keeps its items ordered by the keys of the previous frame and
+    `repair` fixes the few inversions with an insertion-sort pass (O(n) when
+    nothing crossed, O(n + inversions) otherwise).
+
+    Items are stored as a blocked sorted list: consecutive blocks of about
+    DEPTH_BLOCK_SIZE items, with the last key of every block kept in `maxes`.
+    Insertions, removals and wrap moves bisect `maxes` for the block and the
+    block's keys for the slot, so they cost O(log n) plus a shift within one
+    block, never a shift of the whole index. Depth wraps are reported through
+    each object's `depth_listener` so a wrapped object is moved to its new slot
+    directly instead of forcing a resort.
+
+    Keys are `obj.depth`, or `obj.depth - player_depth` for objects added with
+    `relative=True` (enemies and bullets live in absolute depth, stars in
+    view depth). Objects are drawn only when their `batched` flag is set.
+    """
+
+    RESORT_RATIO = 0.125  # Above this share of out-of-order items a full sort is cheaper
+
+    def __init__(self, block_size=DEPTH_BLOCK_SIZE):
+        """
+        Args:
+            block_size (int): Items per block after a repair.
+        """
+        self.block_size = block_size
+        self.blocks = []    # Lists of objects, ascending by key across blocks
+        self.keys = []      # Per block, the key of each item as of the last repair or move
+        self.relative = []  # Per block, whether each item's key is relative to the player depth
+        self.maxes = []     # Last key of each block
+        self.key_of = {}    # Object -> its key in the index, to find it again
+        self.player_depth = 0.0
+        self.moves = 0      # Items moved by repair passes and wrap notifications
+        self.resorts = 0    # Full sorts (many inversions in one frame)
+
+    def __len__(self):
+        return len(self.key_of)
+
+    def __iter__(self):
+        """Iterates the items nearest first (ascending key)."""
+        return chain.from_iterable(self.blocks)
+
+    def key(self, obj, relative):
+        return obj.depth - self.player_depth if relative else obj.depth
+
+    def add(self, obj, relative=False):
+        """
+        Inserts `obj` at its depth and subscribes to its depth wraps.
+
+        Args:
+            obj: Object with `depth`, `batched` and `emit(batch)`.
+            relative (bool): Key by depth relative to the player.
+        """
+        self._insert(obj, relative)
+        obj.depth_listener = self.move
+
+    def extend(self, objects, relative=False):
+        """Adds several objects."""
+        for obj in objects:
+            self.add(obj, relative)
+
+    def _insert(self, obj, relative):
+        key = self.key(obj, relative)
+        self.key_of[obj] = key
+        maxes = self.maxes
+        if not maxes:
+            self.blocks.append([obj])
+            self.keys.append([key])
+            self.relative.append([relative])
+            maxes.append(key)
+            return
+        block = min(bisect_right(maxes, key), len(maxes) - 1)
+        keys = self.keys[block]
+        index = bisect_right(keys, key)
+        self.blocks[block].insert(index, obj)
+        keys.insert(index, key)
+        self.relative[block].insert(index, relative)
+        if index == len(keys) - 1:
+            maxes[block] = key
+        if len(keys) > 2 * self.block_size:
+            self._split(block)
+
+    def _split(self, block):
+        half = len(self.keys[block]) // 2
+        for lists in (self.blocks, self.keys, self.relative):
+            items = lists[block]
+            lists[block:block + 1] = [items[:half], items[half:]]
+        self.maxes[block:block + 1] = [self.keys[block][-1], self.keys[block + 1][-1]]
+
+    def _pop(self, obj):
+        # Bisects to the first item with the object's key, then steps over equal keys
+        key = self.key_of.pop(obj)
+        block = bisect_left(self.maxes, key)
+        while block < len(self.maxes):
+            keys = self.keys[block]
+            items = self.blocks[block]
+            index = bisect_left(keys, key)
+            while index < len(keys) and keys[index] == key:
+                if items[index] is obj:
+                    del items[index]
+                    del keys[index]
+                    relative = self.relative[block].pop(index)
+                    if not keys:
+                        del self.blocks[block], self.keys[block], self.relative[block], self.maxes[block]
+                    else:
+                        self.maxes[block] = keys[-1]
+                    return relative
+                index += 1
+            block += 1
+        raise KeyError(obj)
+
+    def remove(self, obj):
+        """Removes `obj` (no-op if it is not indexed) and unsubscribes from its wraps."""
+        if obj not in self.key_of:
+            return
+        self._pop(obj)
+        obj.depth_listener = None
+
+    def discard(self, objects):
+        """Removes every object in `objects`."""
+        for obj in objects:
+            self.remove(obj)
+
+    def move(self, obj):
+        """
+        Re-slots one object whose depth jumped (a wrap) without touching the rest.
+        Installed as `obj.depth_listener` by `add`.
+        """
+        if obj in self.key_of:
+            self._insert(obj, self._pop(obj))
+            self.moves += 1
+
+    def repair(self, player_depth):
+        """
+        Recomputes every key for this frame, restores ascending order and
+        re-chunks the items into even blocks.
+
+        Args:
+            player_depth (float): Player depth for relative keys.
+        """
+        self.player_depth = player_depth
+        items = list(chain.from_iterable(self.blocks))
+        count = len(items)
+        if not count:
+            return
+        relative = list(chain.from_iterable(self.relative))
+        depths = np.fromiter((obj.depth for obj in items), dtype=np.float64, count=count)
+        offsets = np.fromiter(relative, dtype=bool, count=count) * player_depth
+        keys = depths - offsets
+        out_of_order = np.flatnonzero(keys[1:] < keys[:-1])
+
+        if len(out_of_order) > self.RESORT_RATIO * count:
+            order = np.argsort(keys, kind='stable').tolist()
+            items = [items[i] for i in order]
+            relative = [relative[i] for i in order]
+            keys = keys[order]
+            self.resorts += 1
+        elif len(out_of_order):
+            # Insertion sort from the first inversion; each out-of-order item is
+            # shifted left past the (few) items it crossed
+            keys = keys.tolist()
+            for i in range(int(out_of_order[0]) + 1, count):
+                key = keys[i]
+                j = i - 1
+                if keys[j] <= key:
+                    continue
+                obj = items[i]
+                flag = relative[i]
+                while j >= 0 and keys[j] > key:
+                    keys[j + 1] = keys[j]
+                    items[j + 1] = items[j]
+                    relative[j + 1] = relative[j]
+                    j -= 1
+                keys[j + 1] = key
+                items[j + 1] = obj
+                relative[j + 1] = flag
+                self.moves += i - j - 1
+
+        keys = keys.tolist() if isinstance(keys, np.ndarray) else keys
+        size = self.block_size
+        starts = range(0, count, size)
+        self.blocks = [items[start:start + size] for start in starts]
+        self.keys = [keys[start:start + size] for start in starts]
+        self.relative = [relative[start:start + size] for start in starts]
+        self.maxes = [block[-1] for block in self.keys]
+        self.key_of = dict(zip(items, keys))
+
+    def emit(self, batch, culler=None):
+        """
+        Emits every batched item into `batch` back to front (farthest first).
+
+        Args:
+            batch (SpriteBatch): Batch to fill; the caller flushes it.
+            culler (Culler, optional): Skips items whose screen bounds are off-screen.
+        """
+        for block in reversed(self.blocks):
+            for obj in reversed(block):
+                if obj.batched and (culler is None or culler.visible(obj)):
+                    obj.emit(batch)
@@ -0,0 +1,122 @@
+# dirty_rects.py
+
+import pygame
+
+DIRTY_TILE_SIZE = 32          # Dirty rects are coalesced onto a grid of this many pixels
+DIRTY_FULL_FRAME_RATIO = 0.6  # Above this share of the screen a plain fill + flip is cheaper
+
+class DirtyRectTracker:
+    """
+    Optional dirty-rectangle presentation.
+
+    Everything drawn in a frame reports the rect it touched (blits, draw calls and
+    batch flushes all return one). Next frame only those regions are cleared, and
+    the display is updated with the union of last frame's and this frame's rects,
+    so pixels that didn't change are never cleared, copied or presented.
+
+    Rects are coalesced onto a DIRTY_TILE_SIZE grid and merged into horizontal runs
+    per tile row before being handed to pygame.display.update. When disabled the
+    tracker falls back to fill + flip.
+    """
+
+    def __init__(self, size, enabled=False):
+        """
+        Args:
+            size (tuple): Screen size.
+            enabled (bool): Start in dirty-rect mode.
+        """
+        self.width, self.height = size
+        self.enabled = enabled
+        self.rects = []          # Rects drawn so far this frame
+        self.previous = []       # Merged rects drawn last frame
+        self.full_redraw = True  # First frame (and mode switches) present everything
+        self.presented_area = 0
+
+    def toggle(self):
+        """Switches between dirty-rect and full-frame presentation."""
+        self.enabled = not self.enabled
+        self.full_redraw = True
+        return self.enabled
+
+    def add(self, rect):
+        """Records one rect touched this frame."""
+        self.rects.append(rect)
+
+    def extend(self, rects):
+        """Records several rects touched this frame."""
+        self.rects.extend(rects)
+
+    def begin(self, surface, color=(0, 0, 0)):
+        """
+        Clears the frame: the whole surface in full-frame mode, otherwise only the
+        regions drawn last frame.
+        """
+        self.rects.clear()
+        if not self.enabled or self.full_redraw or self.previous is None:
+            surface.fill(color)
+            return
+        for rect in self.previous:
+            surface.fill(color, rect)
+
+    def present(self):
+        """Pushes the frame to the display and remembers this frame's rects for the next clear."""
+        current = self.merge(self.rects)
+        if not self.enabled or self.full_redraw or current is None or self.previous is None:
+            pygame.display.flip()
+            self.presented_area = self.width * self.height
+            self.full_redraw = False
+        else:
+            updates = self.merge(self.previous + current)
+            if updates is None:
+                pygame.display.flip()
+                self.presented_area = self.width * self.height
+            else:
+                pygame.display.update(updates)
+                self.presented_area = sum(rect.w * rect.h for rect in updates)
+        self.previous = current
+
+    def merge(self, rects):
+        """
+        Coalesces rects onto the tile grid and merges adjacent tiles of a row into runs.
+
+        Returns:
+            list or None: Merged rects clipped to the screen, or None when they would
+            cover more than DIRTY_FULL_FRAME_RATIO of it.
+        """
+        tile = DIRTY_TILE_SIZE
+        columns = (self.width + tile - 1) // tile
+        rows = (self.height + tile - 1) // tile
+        tiles = set()
+        for rect in rects:
+            if rect.w <= 0 or rect.h <= 0:
+                continue
+            left = max(0, rect.left // tile)
+            right = min(columns - 1, (rect.right - 1) // tile)
+            top = max(0, rect.top // tile)
+            bottom = min(rows - 1, (rect.bottom - 1) // tile)
+            for row in range(top, bottom + 1):
+                base = row * columns
+                tiles.update(range(base + left, base + right + 1))
+
+        if len(tiles) > DIRTY_FULL_FRAME_RATIO * columns * rows:
+            return None
+
+        merged = []
+        run_start = None
+        previous = None
+        for index in sorted(tiles):
+            if run_start is not None and index == previous + 1 and index % columns != 0:
+                previous = index
+                continue
+            if run_start is not None:
+                merged.append(self._run_rect(run_start, previous, columns))
+            run_start = previous = index
+        if run_start is not None:
+            merged.append(self._run_rect(run_start, previous, columns))
+        return merged
+
+    def _run_rect(self, first, last, columns):
+        tile = DIRTY_TILE_SIZE
+        row, column = divmod(first, columns)
+        rect = pygame.Rect(column * tile, row * tile, (last - first + 1) * tile, tile)
+        return rect.clip(0, 0, self.width, self.height)
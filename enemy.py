@@ -5,8 +5,11 @@ import random
 import math
 from pygame.math import Vector2
 from constants import *
-from spaceship import draw_spaceship
+from spaceship import ship_sprite
 from bullet import Bullet
+from sprite_cache import SpriteCache
+from sim_clock import WALL_CLOCK
+from spatial_hash import SpatialHash
 
 DEPTH_FIRE_THRESHOLD = 0.25
 FIRE_DISTANCE_THRESHOLD = 222
@@ -50,7 +53,33 @@ def draw_health_bar(surface, position, health, max_health, scale_factor=1.0):
     health_rect = pygame.Rect(bar_x, bar_y, bar_width * health_ratio, bar_height)
     pygame.draw.rect(surface, (0, 255, 0), health_rect)  # Green fill
 
+HEALTH_BAR_CACHE = SpriteCache(512, name="health_bar")
+
+def render_health_bar(health, max_health, scale_factor=1.0):
+    """
+    Renders the same bar as draw_health_bar into its own surface for batching.
+
+    Returns:
+        tuple: (surface, offset) where offset is the bar's top-left relative to the enemy position.
+    """
+    health_ratio = health / max_health
+    bar_width = 40 * scale_factor
+    bar_height = 6 * scale_factor
+    bar_size = (int(bar_width), max(1, int(bar_height)))
+    fill_rect = (0, 0, int(bar_width * health_ratio), int(bar_height))
+
+    def build():
+        bar_surface = pygame.Surface(bar_size)
+        bar_surface.fill((255, 0, 0))  # Red border
+        bar_surface.fill((0, 255, 0), fill_rect)  # Green fill
+        return bar_surface
+
+    # Keyed by the pixel sizes, so the same bar surface (and texture) is reused across frames
+    bar_surface = HEALTH_BAR_CACHE.get((bar_size, fill_rect), build)
+    return bar_surface, (-(bar_width // 2), -20 * scale_factor)
+
 MAX_DEPTH_SCALE = 2
+SHADE_DEPTH_STEPS = 32  # Depth buckets for the ship's depth shading
 
 class TypeDEnemy:
     """
@@ -71,12 +100,27 @@ class TypeDEnemy:
     MIN_ORBIT_TIME = 2.0  # Minimum time to stay in orbit (seconds)
     MAX_ORBIT_DISTANCE = 255  # Maximum distance to consider new star
     
-    def __init__(self, stars, enemies):
-        """Initialize the enemy with improved orbital transition management."""
-        self.position = Vector2(random.uniform(0, WIDTH), random.uniform(0, HEIGHT))
-        self.direction = Vector2(1, 0).rotate(random.uniform(0, 360))
+    def __init__(self, stars, enemies, clock=WALL_CLOCK, rng=random, star_hash=None, enemy_hash=None):
+        """
+        Initialize the enemy with improved orbital transition management.
+
+        Args:
+            stars (list): Stars the enemy can orbit.
+            enemies (list): All enemies, shared with the game.
+            clock (SimClock): Time source for movement and firing.
+            rng (random.Random): Random source; the `random` module by default.
+            star_hash (SpatialHash, optional): The game's per-frame index of `stars`.
+            enemy_hash (SpatialHash, optional): The game's per-frame index of `enemies`.
+                Without them, target searches index the lists on the spot.
+        """
+        self.star_hash = star_hash
+        self.enemy_hash = enemy_hash
+        self.clock = clock
+        self.rng = rng
+        self.position = Vector2(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+        self.direction = Vector2(1, 0).rotate(rng.uniform(0, 360))
         self.speed = 20
-        self.depth = random.uniform(self.MIN_DEPTH_BUFFER, self.MAX_DEPTH_BUFFER)
+        self.depth = rng.uniform(self.MIN_DEPTH_BUFFER, self.MAX_DEPTH_BUFFER)
         self.target_depth = self.depth
         self.velocity = self.direction * self.speed
         self.stars = stars
@@ -88,18 +132,18 @@ class TypeDEnemy:
         self.current_radius = 5
         # Movement personalization parameters
         self.movement_traits = {
-            'phase_offset': random.uniform(0, 2 * math.pi),  # Unique starting phase
-            'lateral_frequency': random.uniform(0.8, 1.4),   # Individual lateral oscillation rate
-            'vertical_frequency': random.uniform(0.7, 1.2),  # Individual vertical oscillation rate
-            'wander_frequency': random.uniform(0.9, 1.3),    # Personal wander rate
-            'turn_bias': random.uniform(0.8, 1.2),          # Individual turning preference
+            'phase_offset': rng.uniform(0, 2 * math.pi),  # Unique starting phase
+            'lateral_frequency': rng.uniform(0.8, 1.4),   # Individual lateral oscillation rate
+            'vertical_frequency': rng.uniform(0.7, 1.2),  # Individual vertical oscillation rate
+            'wander_frequency': rng.uniform(0.9, 1.3),    # Personal wander rate
+            'turn_bias': rng.uniform(0.8, 1.2),          # Individual turning preference
         }
         
         self.orbit_radius = 45
         self.orbit_angle = 0
         self.state = 'normal'
         self.base_direction = "up"
-        self.ship_color = (random.randint(55, 255), random.randint(55, 255), random.randint(55, 255))
+        self.ship_color = (rng.randint(55, 255), rng.randint(55, 255), rng.randint(55, 255))
         self.turn_rate = 45  # **Degrees per second**
         self.relative_velocity = Vector2(0, 0)  # Tracks relative velocity with respect to player
         self.enemies = enemies 
@@ -112,6 +156,17 @@ class TypeDEnemy:
         self.type = "enemy"
         self.health = 25
         self.max_health = 25
+        self._shade_bucket = None
+        self._shade_color = self.ship_color
+        self.trail = ENEMY_TRAILS  # Stamp into the game's TrailBuffer
+        self.batched = True
+        self.depth_listener = None  # Called with the enemy after a wrap (DepthIndex.move)
+
+    def spatial(self):
+        """Returns the (star, enemy) spatial hashes: the game's, or built from the lists."""
+        if self.star_hash is None or self.enemy_hash is None:
+            return SpatialHash.build(self.stars), SpatialHash.build(self.enemies)
+        return self.star_hash, self.enemy_hash
 
     def find_next_target(self):
         """
@@ -126,9 +181,13 @@ class TypeDEnemy:
 
         forward_direction = self.direction.normalize()
         candidates = []
+        star_hash, enemy_hash = self.spatial()
+
+        # Candidates are ranked by alignment before distance, so a target anywhere in the
+        # world can win: the queries cover the whole world (`reach`), in list order
 
         # **Check for potential stars to lock onto**
-        for star in self.stars:
+        for _, star in star_hash.query_radius(self.position, star_hash.reach):
             if star == self.orbit_target:  # Ignore current target
                 continue
             dx = min(abs(star.position.x - self.position.x), WIDTH - abs(star.position.x - self.position.x))
@@ -139,7 +198,7 @@ class TypeDEnemy:
             candidates.append(("star", alignment_score, distance, star))
 
         # **Check for potential enemy ships to lock onto**
-        for enemy in self.enemies:
+        for _, enemy in enemy_hash.query_radius(self.position, enemy_hash.reach):
             if enemy == self or enemy == self.target_enemy:  # Ignore self and current target
                 continue
             dx = min(abs(enemy.position.x - self.position.x), WIDTH - abs(enemy.position.x - self.position.x))
@@ -274,7 +333,7 @@ class TypeDEnemy:
             return None  # Player is too far away in 2D space to fire
         
         # --- 3. Rate-limiting for fire rate ---
-        current_time = pygame.time.get_ticks() / 1000.0  # Convert ms to seconds
+        current_time = self.clock.seconds
         if (current_time - self.last_shot_time) > self.fire_rate:
             
             # Decide whether bullet should move inward or outward in depth
@@ -295,7 +354,7 @@ class TypeDEnemy:
             direction_vector = (player_world_position - self.position).normalize()
 
             # Add random spread to the bullet's direction
-            spread_angle = random.uniform(-0.1, 0.1)  # Random spread between -0.1 and 0.1 radians
+            spread_angle = self.rng.uniform(-0.1, 0.1)  # Random spread between -0.1 and 0.1 radians
             cos_angle = math.cos(spread_angle)
             sin_angle = math.sin(spread_angle)
             
@@ -312,7 +371,8 @@ class TypeDEnemy:
                 spaceship_height=10,
                 player_velocity=player_velocity,
                 player_depth=player_depth,
-                is_enemy_bullet=True
+                is_enemy_bullet=True,
+                clock=self.clock
             )
 
             # Set bullet velocity (combines enemy-to-player vector and player's current velocity)
@@ -343,14 +403,12 @@ class TypeDEnemy:
                 
     def find_better_enemy(self):
         candidates = []
+        _, enemy_hash = self.spatial()
 
-        for i, enemy in enumerate(self.enemies):
-            if not hasattr(enemy, 'position') or not hasattr(enemy, 'depth'):
-                continue
-
+        # Ranked by alignment first, so every enemy in the world is a candidate
+        for _, enemy in enemy_hash.query_radius(self.position, enemy_hash.reach):
             if enemy == self:  # Don't lock onto itself
                 continue
-
             dx = min(abs(enemy.position.x - self.position.x), WIDTH - abs(enemy.position.x - self.position.x))
             dy = min(abs(enemy.position.y - self.position.y), HEIGHT - abs(enemy.position.y - self.position.y))
             distance = math.sqrt(dx**2 + dy**2)
@@ -465,8 +523,10 @@ class TypeDEnemy:
         """
         current_depth = self.orbit_star.depth if self.orbit_star else self.depth
         
+        star_hash, _ = self.spatial()
+        # The wrap-around radius query returns a superset of the stars in direct range
         suitable_stars = [
-            star for star in self.stars
+            star for _, star in star_hash.query_radius(self.position, self.MAX_ORBIT_DISTANCE)
             if (star != self.orbit_star and
                 self.MIN_DEPTH_BOUNDARY <= star.depth <= self.MAX_DEPTH_BOUNDARY and
                 (star.position - self.position).length() < self.MAX_ORBIT_DISTANCE)
@@ -474,18 +534,36 @@ class TypeDEnemy:
         
         return min(suitable_stars, key=lambda s: (s.position - self.position).length()) if suitable_stars else None
 
-    def draw(self, surface):
+    def screen_bounds(self):
+        """
+        Screen rect covered by the ship sprite and its health bar.
+
+        Returns:
+            pygame.Rect: Area emit() draws into.
+        """
         scale_factor = max(0.5, min(1.5, 1 / self.depth))
         ship_shape = SPACESHIP_SHAPES.get(self.base_direction, SPACESHIP_SHAPES["up"])
-        shade_color = tuple(
-            int(c * (1 - ((self.depth - MIN_DEPTH) / (MAX_DEPTH - MIN_DEPTH)) * 0.6))
-            for c in self.ship_color
-        )
-        draw_spaceship(surface, ship_shape, self.position, scale_factor, shade_color)
+        width, height = ship_sprite(ship_shape, scale_factor, self.get_shade_color()).get_size()
+        bounds = pygame.Rect(int(self.position.x), int(self.position.y), width, height)
+        bar_width = 40 * scale_factor
+        return bounds.union(pygame.Rect(int(self.position.x - bar_width // 2), int(self.position.y - 20 * scale_factor),
+                                        int(bar_width), max(1, int(6 * scale_factor))))
 
-        # Draw health bar if needed
-        if self in self.enemies or self in self.tagged_enemies:
-            draw_health_bar(surface, self.position, self.health, self.max_health, scale_factor)
+    def emit(self, batch):
+        """
+        Queues the ship sprite into a sprite batch (the health bar goes in emit_overlay),
+        and stamps it into the batch's trail buffer when `trail` is set.
+
+        Args:
+            batch (SpriteBatch): Batch collecting this frame's blits.
+        """
+        scale_factor = max(0.5, min(1.5, 1 / self.depth))
+        ship_shape = SPACESHIP_SHAPES.get(self.base_direction, SPACESHIP_SHAPES["up"])
+        sprite = ship_sprite(ship_shape, scale_factor, self.get_shade_color())
+        dest = (int(self.position.x), int(self.position.y))
+        batch.add(sprite, dest)
+        if self.trail and batch.trails is not None:
+            batch.trails.stamp(sprite, dest)
         
         '''
         font_size = int(21)# * scale_factor)
@@ -501,6 +579,34 @@ class TypeDEnemy:
         surface.blit(depth_surf, (text_x, text_y))'''
         
         
+    def emit_overlay(self, batch):
+        """
+        Queues the cached health bar into the overlay batch.
+
+        Args:
+            batch (SpriteBatch): Overlay batch, drawn after the world layers.
+        """
+        if self in self.enemies or self in self.tagged_enemies:
+            scale_factor = max(0.5, min(1.5, 1 / self.depth))
+            bar_surface, (offset_x, offset_y) = render_health_bar(self.health, self.max_health, scale_factor)
+            batch.add(bar_surface, (int(self.position.x + offset_x), int(self.position.y + offset_y)))
+
+    def get_shade_color(self):
+        """
+        Returns the ship color darkened by depth, recomputed only when the depth
+        moves into a different one of SHADE_DEPTH_STEPS buckets.
+        """
+        depth_ratio = (self.depth - MIN_DEPTH) / (MAX_DEPTH - MIN_DEPTH)
+        bucket = int(depth_ratio * SHADE_DEPTH_STEPS)
+        if bucket != self._shade_bucket:
+            self._shade_bucket = bucket
+            shade_ratio = bucket / SHADE_DEPTH_STEPS
+            self._shade_color = tuple(
+                max(0, int(c * (1 - shade_ratio * 0.6)))
+                for c in self.ship_color
+            )
+        return self._shade_color
+
     def smooth_turning(self, dt):
         """
         Gradually rotates the ship to face its intended direction based on current state.
@@ -573,6 +679,8 @@ class TypeDEnemy:
 
         if wrapped:
             self.stop_orbiting()
+            if self.depth_listener is not None:
+                self.depth_listener(self)
 
     def update_direction(self, dt):
         """
@@ -588,7 +696,7 @@ class TypeDEnemy:
             return
 
         # Individual time-based variations
-        personal_time = (pygame.time.get_ticks() * 0.01 + self.movement_traits['phase_offset'])
+        personal_time = (self.clock.ticks * 0.01 + self.movement_traits['phase_offset'])
         
         # Personalized turn rate calculation
         base_turn_rate = self.turn_rate * self.movement_traits['turn_bias']
@@ -631,7 +739,7 @@ class TypeDEnemy:
         smooth and natural motion.
         """
         # Personal time-based modulation
-        personal_time = pygame.time.get_ticks() * 0.01 + self.movement_traits['phase_offset']
+        personal_time = self.clock.ticks * 0.01 + self.movement_traits['phase_offset']
         
         # Individual trajectory adjustments
         lateral_offset = math.sin(personal_time * self.movement_traits['lateral_frequency']) * 0.3
@@ -0,0 +1,164 @@
+# flame.py
+
+import math
+import pygame
+from pygame.math import Vector2
+from constants import DIRECTION_VECTORS
+from sprite_cache import SpriteCache, finalize_sprite
+
+FLAME_SEGMENTS = 20
+FLAME_FRAMES = 32                          # Animation frames per flicker cycle
+FLAME_WAVE_SPEED = 0.005                   # Radians of flicker per millisecond
+FLAME_PERIOD_MS = 2 * math.pi / FLAME_WAVE_SPEED
+FLAME_LENGTH_STEP = 4                      # Flame lengths are baked in buckets of this many pixels
+FLAME_MAX_RADIUS = 5
+FLAME_WAVE_AMPLITUDE = 2
+FLAME_CACHE_BYTES = 16 * 1024 * 1024       # Pixel budget of the baked frames
+FLAME_SETTLE_FRAMES = 8                    # Draws at one length before its frames are baked
+FLAME_MAX_BAKED_AREA = 16384               # Larger frames (long diagonal flames) blit slower than they draw
+
+FLAME_FRAME_CACHE = SpriteCache(4096, name="flame_frame", max_bytes=FLAME_CACHE_BYTES)
+
+def draw_flame_segments(surface, flame_start, flame_direction, flame_length, phase):
+    """
+    Draws the procedural flame: FLAME_SEGMENTS circles running from `flame_start`
+    along `flame_direction`, fading cyan -> blue and shrinking, with a sinusoidal
+    sideways flicker.
+
+    Args:
+        surface (pygame.Surface): Target surface.
+        flame_start (Vector2): Point the flame grows from.
+        flame_direction (Vector2): Unit vector the flame points along.
+        flame_length (float): Length of the flame in pixels.
+        phase (float): Flicker phase in radians.
+
+    Returns:
+        pygame.Rect: Area drawn.
+    """
+    drawn = None
+    for i in range(FLAME_SEGMENTS):
+        t = i / FLAME_SEGMENTS  # This defines the distance along the flame (from 0 to 1)
+
+        # Sinusoidal wave to give the flame a "flickering" effect
+        wave_offset = math.sin(phase + i) * FLAME_WAVE_AMPLITUDE
+        segment_pos = flame_start + flame_direction * (flame_length * t) + Vector2(wave_offset, 0)
+
+        # Color gradient from cyan (0,255,255) to blue (0,0,255) as you move away from the ship
+        color = (0, int(255 - (255 * t)), 255)
+
+        # Flame size gets smaller further from the ship (radius shrinks as t increases)
+        radius = int(FLAME_MAX_RADIUS - 3 * t)
+        rect = pygame.draw.circle(surface, color, (int(segment_pos.x), int(segment_pos.y)), radius)
+        drawn = rect if drawn is None else drawn.union(rect)
+    return drawn
+
+def flame_frame_bounds(base_direction, flame_length):
+    """
+    Returns the (left, top, width, height) of a baked flame frame, relative to the flame start.
+
+    Args:
+        base_direction (str): Ship direction without scroll suffix.
+        flame_length (float): Length of the flame in pixels.
+    """
+    tip = -Vector2(DIRECTION_VECTORS[base_direction]).normalize() * flame_length
+    pad = FLAME_MAX_RADIUS + FLAME_WAVE_AMPLITUDE + 1
+    left = int(math.floor(min(0, tip.x))) - pad
+    top = int(math.floor(min(0, tip.y))) - pad
+    width = int(math.ceil(max(0, tip.x))) + pad - left + 1
+    height = int(math.ceil(max(0, tip.y))) + pad - top + 1
+    return left, top, width, height
+
+def build_flame_frame(base_direction, flame_length, frame):
+    """
+    Bakes one animation frame of the procedural flame.
+
+    Args:
+        base_direction (str): Ship direction without scroll suffix (e.g. "up-left").
+        flame_length (float): Length of the flame in pixels.
+        frame (int): Frame of the flicker cycle, 0..FLAME_FRAMES - 1.
+
+    Returns:
+        tuple: (surface, origin) where origin is the flame start inside the frame.
+    """
+    flame_direction = -Vector2(DIRECTION_VECTORS[base_direction]).normalize()
+    left, top, width, height = flame_frame_bounds(base_direction, flame_length)
+    origin = (-left, -top)
+
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    draw_flame_segments(surface, Vector2(origin), flame_direction, flame_length,
+                        2 * math.pi * frame / FLAME_FRAMES)
+    return finalize_sprite(surface), origin
+
+def flame_sprite(base_direction, flame_length, time_ms, flame_start):
+    """
+    Returns the flame animation frame for the given time and where to blit it.
+
+    Args:
+        base_direction (str): Ship direction without scroll suffix.
+        flame_length (float): Desired flame length; snapped to FLAME_LENGTH_STEP.
+        time_ms (int): Current time in milliseconds, selects the animation frame.
+        flame_start (Vector2): On-screen point the flame grows from.
+
+    Returns:
+        tuple: (surface, dest) with dest the top-left blit position.
+    """
+    length_bucket = max(1, int(round(flame_length / FLAME_LENGTH_STEP)))
+    frame = int((time_ms % FLAME_PERIOD_MS) / FLAME_PERIOD_MS * FLAME_FRAMES) % FLAME_FRAMES
+    sprite, origin = FLAME_FRAME_CACHE.get(
+        (base_direction, length_bucket, frame),
+        lambda: build_flame_frame(base_direction, length_bucket * FLAME_LENGTH_STEP, frame)
+    )
+    return sprite, (int(flame_start.x) - origin[0], int(flame_start.y) - origin[1])
+
+class FlameRenderer:
+    """
+    Draws the ship flame, choosing per frame between the procedural segments and
+    a baked frame.
+
+    While the ship accelerates the flame length changes bucket every frame or two,
+    so a baked frame would be used once and thrown away; those frames are drawn
+    procedurally. Once the direction and length bucket have held for
+    FLAME_SETTLE_FRAMES draws, frames come from FLAME_FRAME_CACHE (baked one at a
+    time, on first use) and each costs a single blit. Flames whose frame would
+    exceed FLAME_MAX_BAKED_AREA pixels (long diagonals, mostly empty) stay procedural.
+    """
+
+    def __init__(self, settle_frames=FLAME_SETTLE_FRAMES):
+        """
+        Args:
+            settle_frames (int): Draws at one direction and length bucket before baking.
+        """
+        self.settle_frames = settle_frames
+        self.key = None   # (direction, length bucket) of the last draw
+        self.held = 0     # Consecutive draws at that key
+        self.bakeable = False  # Whether frames at that key are small enough to blit
+
+    def draw(self, surface, base_direction, flame_length, time_ms, flame_start):
+        """
+        Draws the flame onto `surface`.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            base_direction (str): Ship direction without scroll suffix.
+            flame_length (float): Length of the flame in pixels.
+            time_ms (float): Current time in milliseconds, drives the flicker.
+            flame_start (Vector2): On-screen point the flame grows from.
+
+        Returns:
+            pygame.Rect: Area drawn.
+        """
+        length_bucket = max(1, int(round(flame_length / FLAME_LENGTH_STEP)))
+        key = (base_direction, length_bucket)
+        if key == self.key:
+            self.held += 1
+        else:
+            _, _, width, height = flame_frame_bounds(base_direction, length_bucket * FLAME_LENGTH_STEP)
+            self.key = key
+            self.held = 1
+            self.bakeable = width * height <= FLAME_MAX_BAKED_AREA
+        if self.bakeable and self.held > self.settle_frames:
+            sprite, dest = flame_sprite(base_direction, flame_length, time_ms, flame_start)
+            return surface.blit(sprite, dest)
+        flame_direction = -Vector2(DIRECTION_VECTORS[base_direction]).normalize()
+        return draw_flame_segments(surface, flame_start, flame_direction, flame_length,
+                                   time_ms * FLAME_WAVE_SPEED)
@@ -2,8 +2,10 @@
 
 import pygame
 import random
+import numpy as np
 from pygame.math import Vector2
 import math
+import os
 from constants import *
 from star import *
 from player import *
@@ -12,23 +14,91 @@ from utils import *
 from enemy import *
 from spaceship import *
 from racing_mode import *
+from sprite_batch import SpriteBatch
+from render_queue import RenderQueue
+from depth_index import DepthIndex
+from culling import Culler
+from render_backend import create_backend, ScaledCanvas
+from starfield import StarFieldRenderer
+from flame import FlameRenderer
+from hud import HUD
+from overlay import add_centered, add_ring, add_arc, box_sprite
+from dirty_rects import DirtyRectTracker
+from lighting import light_sprite
+from trails import TrailBuffer
+from tile_render import TileRenderer
+from observation import ObservationRenderer, OBSERVATION_SIZE
+from timestep import FixedTimestep, StateInterpolator
+from sim_clock import SimClock
+from spatial_hash import SpatialHash, SPATIAL_DEPTH_CELL
+from collision import SweptBodies, swept_hits
+import itertools
+import time
 
 FLAME_SCALE = 2
 MAX_FLAME_LENGTH = 256
+FLAME_LIGHT_COLOR = (0, 160, 255)
+FLAME_LIGHT_PADDING = 12  # Glow reaches this far past the flame ends
 
 class Game:
-    def __init__(self):
+    def __init__(self, backend=RENDER_BACKEND, render_scale=RENDER_SCALE, additive_glow=ADDITIVE_GLOW,
+                 render_threads=RENDER_THREADS, simulation_rate=SIMULATION_RATE, frame_rate=FRAME_RATE,
+                 headless=False, seed=SIMULATION_SEED):
+        """
+        Args:
+            backend (str): Render backend, one of render_backend.RENDER_BACKENDS.
+            render_scale (float): Resolution the world is drawn at, as a fraction of
+                the screen (surface backend only; the HUD stays at native resolution).
+            additive_glow (bool): Draw star, bullet and flame glow as opaque light
+                sprites added with BLEND_RGB_ADD instead of alpha-blended glow sprites.
+            render_threads (int): Draw the world batches as this many horizontal tiles on
+                a thread pool (surface backend at full resolution; 0 draws on the main thread).
+            simulation_rate (float): Fixed simulation steps per second.
+            frame_rate (int): Rendered frames per second cap (0: uncapped). Drawn frames
+                interpolate between the last two simulation steps.
+            headless (bool): Open no display and draw nothing; the game is driven with
+                step() (see headless.py). Rendering options are ignored.
+            seed (int, optional): Seed for the game's random generator; with the same
+                seed and inputs a run plays out the same at any speed.
+        """
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN if FULLSCREEN else 0)
-        pygame.display.set_caption("Pulse Vector")
+        self.headless = headless
+        self.backend = None if headless else create_backend(backend, (WIDTH, HEIGHT), FULLSCREEN)
+        self.screen = None if headless else self.backend.screen
+        # World layers are drawn to `scene`: the screen itself, or a smaller canvas upscaled once per frame
+        self.scene = self.screen
+        if render_scale != 1.0 and not headless:
+            if self.backend.supports_dirty_rects:
+                self.scene = ScaledCanvas((WIDTH, HEIGHT), render_scale)
+            else:
+                print(f"Render scale is not available with the {self.backend.name} backend; drawing at full resolution.")
+        self.tiles = None  # Tile-parallel world drawing, see tile_render.py
+        if render_threads and not headless:
+            if (os.cpu_count() or 1) < 2:
+                print("Tile-parallel rendering needs more than one CPU; drawing on the main thread.")
+            elif self.backend.supports_dirty_rects and self.scene is self.screen:
+                self.tiles = TileRenderer(self.screen, render_threads)
+            else:
+                print("Tile-parallel rendering needs the surface backend at full resolution; drawing on the main thread.")
         self.clock = pygame.time.Clock()
+        self.frame_rate = frame_rate
+        self.timestep = FixedTimestep(simulation_rate)
+        self.interpolator = StateInterpolator()
+        self.delta_time = self.timestep.dt
+        self.sim_clock = SimClock()  # Simulated time, advanced by step()
+        self.rng = random.Random(seed)  # Every random decision of the world and its objects
+        # Wrap-around spatial indexes for target searches, clicks and race captures, rebuilt every step
+        self.star_hash = SpatialHash()
+        self.enemy_hash = SpatialHash(depth_cell=SPATIAL_DEPTH_CELL)
         self.running = True
         self.player = Player()
         self.stars = [
             Star(
-                random.uniform(0, WIDTH),
-                random.uniform(0, HEIGHT),
-                random.uniform(MIN_DEPTH, MAX_DEPTH)
+                self.rng.uniform(0, WIDTH),
+                self.rng.uniform(0, HEIGHT),
+                self.rng.uniform(MIN_DEPTH, MAX_DEPTH),
+                self.sim_clock,
+                self.rng
             ) for _ in range(NUM_STARS)
         ]
         self.target_star = None
@@ -36,8 +106,10 @@ class Game:
         self.enemy_total = 16
         self.enemies = []
         for _ in range(self.enemy_total):
-            enemy = TypeDEnemy(self.stars, self.enemies)
+            enemy = TypeDEnemy(self.stars, self.enemies, self.sim_clock, self.rng, self.star_hash, self.enemy_hash)
             self.enemies.append(enemy)
+        self.star_hash.invalidate(self.stars)
+        self.enemy_hash.invalidate(self.enemies)
         self.last_shot_time = 0
         self.fire_delay = 250
 
@@ -59,6 +131,22 @@ class Game:
         self.lock_timer = 0
         self.lock_on_duration = 1.0  # 1 second required to lock on
         self.lock_indicator_color = (0, 255, 0)  # Green color for lock-on
+        self.batch = SpriteBatch()  # Reused per depth layer in draw_scene
+        self.flame = FlameRenderer()  # Procedural while the flame grows, baked frames once it holds
+        self.additive_glow = additive_glow
+        self.batch.additive_glow = additive_glow  # Star, bullet and flame glow
+        self.trails = TrailBuffer(self.scene, (WIDTH, HEIGHT))  # Motion trails of objects with `trail` set
+        self.batch.trails = self.trails
+        self.depth_index = DepthIndex()  # Stars, enemies and bullets, kept in depth order across frames
+        self.depth_index.extend(self.stars)
+        self.depth_index.extend(self.enemies, relative=True)
+        self.near_queue = RenderQueue(64)  # Bullets in front of the player
+        self.culler = Culler()  # Off-screen world objects are skipped; see culler.stats()
+        self.starfield = StarFieldRenderer(render_scale=getattr(self.scene, "render_scale", 1.0))  # Star level of detail
+        self.hud = HUD()  # Retained HUD, re-rendered only when a displayed value changes
+        self.dirty = DirtyRectTracker((WIDTH, HEIGHT), DIRTY_RECTS and self.supports_dirty_rects())  # F2 toggles dirty-rect presentation
+        self.render_times = []  # Recent draw + present times in ms, reported on toggle
+        self.observer = None  # ObservationRenderer, created by the first observe()
 
     def cycle_target_enemy(self, forward=True):
         """Cycles the target_enemy_index to the next enemy."""
@@ -80,212 +168,74 @@ class Game:
         self.target_star = None  # Clear any star target
         print(f"Target enemy set to {self.target_enemy}. Auto-Follow remains {'ON' if self.player.auto_follow_active else 'OFF'}.")
 
-    def draw_hud(self):
-        """Draws the game's HUD including player health, enemy status, and auto-follow status."""
-        font = pygame.font.SysFont(None, 36)  # Font for the HUD text
-
-        # 1. **Player Health Bar (Top-Left)**
-        player_health_ratio = self.player.health / self.player.max_health
-        health_bar_width = 200
-        health_bar_height = 20
-        health_bar_x = 10
-        health_bar_y = 10
-
-        # Draw the border of the health bar
-        pygame.draw.rect(self.screen, (255, 0, 0), 
-                         (health_bar_x, health_bar_y, health_bar_width, health_bar_height))  # Red border
-
-        # Draw the actual health amount inside the bar
-        pygame.draw.rect(self.screen, (0, 255, 0), 
-                         (health_bar_x, health_bar_y, int(health_bar_width * player_health_ratio), health_bar_height))  # Green fill
-
-        # Display player's health as text
-        player_health_text = f"Health: {self.player.health} / {self.player.max_health}"
-        health_text_surface = font.render(player_health_text, True, (255, 255, 255))  # White text
-        self.screen.blit(health_text_surface, (health_bar_x, health_bar_y + health_bar_height + 5))  # Slightly below health bar
-
-        # 2. **Tagged Enemies Count (Top-Center)**
-        tagged_count = len(self.tagged_enemies)
-        total_enemies = len(self.enemies)
-        tagged_text = f"Tagged Enemies: {tagged_count} / {total_enemies}"
-        tagged_text_surface = font.render(tagged_text, True, (255, 255, 255))  # White text
-        self.screen.blit(tagged_text_surface, (WIDTH // 2 - tagged_text_surface.get_width() // 2, 10))  # Centered at the top
-
-        # 3. **Auto-Follow Status (Bottom-Left)**
-        if self.player.auto_follow_active and isinstance(self.player.auto_follow_target, TypeDEnemy):
-            follow_text = "Auto-pilot: ON"
-            follow_color = (0, 255, 0)  # Green
-        else:
-            follow_text = "Auto-pilot: OFF"
-            follow_color = (255, 0, 0)  # Red
-
-        follow_surface = font.render(follow_text, True, follow_color)
-        self.screen.blit(follow_surface, (10, HEIGHT - 50))  # Bottom-left corner
-
-        # 4. **Lock-On Status (Bottom-Center)**
-        if self.target_enemy is not None:
-            lock_status_text = f"Target: {self.target_enemy.type}"
-            lock_status_color = (0, 255, 0)  # Green if locked on
-        else:
-            lock_status_text = "No Target"
-            lock_status_color = (255, 0, 0)  # Red if no lock-on target
+    def draw_hud(self, rects=None):
+        """
+        Draws the game's HUD including player health, enemy status, and auto-follow status.
 
-        lock_status_surface = font.render(lock_status_text, True, lock_status_color)
-        self.screen.blit(lock_status_surface, (WIDTH // 2 - lock_status_surface.get_width() // 2, HEIGHT - 50))  # Bottom-center
+        Args:
+            rects (list, optional): Receives the rects drawn, for dirty-rect presentation.
+        """
+        auto_follow = self.player.auto_follow_active and isinstance(self.player.auto_follow_target, TypeDEnemy)
+        self.hud.draw(
+            self.screen,
+            self.player.health,
+            self.player.max_health,
+            len(self.tagged_enemies),
+            len(self.enemies),
+            auto_follow,
+            self.target_enemy.type if self.target_enemy is not None else None,
+            rects
+        )
 
     def draw_scene(self):
         """
         Implements a precise depth-based rendering system that correctly interleaves
         world objects based on their distance from the viewer.
         """
-        self.screen.fill((0, 0, 0))
+        # In dirty-rect mode only what was drawn last frame is cleared, and everything
+        # drawn below reports its rect so present() can update just those regions
+        scene = self.scene
+        self.dirty.begin(scene)
+        rects = self.dirty.rects if self.dirty.enabled else None
+
+        def mark(rect):
+            if rect is not None:
+                self.backend.touch(rect)
+                if rects is not None:
+                    rects.append(rect)
+
+        # Distant stars are plotted as points in one pass; only the rest are sorted and batched
+        self.starfield.partition(self.stars, keep=self.target_star)
+        self.starfield.draw_far(scene, rects)
+
+        # Faded trails of earlier frames go behind everything drawn this frame
+        lit = self.trails.composite(scene)
+        if lit is not None and rects is not None:
+            rects.append(lit)
 
-        # Unified collection for all world objects
-        world_objects = []
         player_depth = self.player.depth  # Get the player's current depth
 
-        # Add all world objects with consistent depth values
-        for star in self.stars:
-            world_objects.append({
-                'depth': star.depth,
-                'object': star,
-                'type': 'star',
-                'is_target': star == self.target_star
-            })
-
-        for enemy in self.enemies:
-            world_objects.append({
-                'depth': enemy.depth - player_depth,
-                'object': enemy,
-                'type': 'enemy'
-            })
-
-        # Separate bullets into "far" and "shallow" based on player depth
-        far_bullets = []
-        shallow_bullets = []
+        # Separate bullets into "far" (world layer) and "shallow" (drawn over the player)
+        near_queue = self.near_queue
         for bullet in self.bullets:
-            if bullet.depth > player_depth:
-                far_bullets.append({
-                    'depth': bullet.depth,
-                    'object': bullet,
-                    'type': 'bullet'
-                })
-            else:
-                shallow_bullets.append({
-                    'depth': bullet.depth,
-                    'object': bullet,
-                    'type': 'bullet'
-                })
-
-     # Sort by depth (ascending) - this ensures furthest objects draw first
-        world_objects.sort(key=lambda x: x['depth'])
-        for obj_info in world_objects:
-            obj = obj_info['object']
-            obj_type = obj_info['type']
-            if obj_type == 'star':
-                obj.draw(self.screen)
-            elif obj_type == 'enemy':
-                obj.draw(self.screen)
-                if obj == self.target_enemy:  # Highlight targeted enemy
-                    # Calculate radius of the target circle
-                    circle_radius = max(20, 50 / obj.depth)  # Dynamic size based on depth
-
-                    # Calculate player position (center of screen)
-                    player_pos = Vector2(WIDTH // 2, HEIGHT // 2)
-
-                    # Calculate distance from player to the enemy
-                    distance_to_target = (obj.position - player_pos).length()
-
-                    if obj in self.tagged_enemies:
-                        # If the enemy is already tagged, draw a full green circle
-                        circle_color = (0, 255, 0)
-                        pygame.draw.circle(self.screen, circle_color, (int(obj.position.x), int(obj.position.y)), int(circle_radius), 2)
-                    else:
-                        # Change color to green if the player is inside the circle, else red
-                        circle_color = (0, 255, 0) if distance_to_target <= circle_radius else (255, 0, 0)
-                        pygame.draw.circle(self.screen, circle_color, (int(obj.position.x), int(obj.position.y)), int(circle_radius), 2)
-
-                        # Draw progress bar if within proximity
-                        if distance_to_target <= circle_radius:
-                            progress_ratio = self.tag_timer / 1000.0  # Assuming tag_timer is in milliseconds
-                            progress_ratio = min(max(progress_ratio, 0.0), 1.0)  # Clamp between 0 and 1
-                            start_angle = -math.pi / 2  # Start at the top
-                            end_angle = start_angle + (2 * math.pi * progress_ratio)
-                            pygame.draw.arc(
-                                self.screen,
-                                (0, 255, 0),  # Green color for progress
-                                [
-                                    int(obj.position.x - circle_radius),
-                                    int(obj.position.y - circle_radius),
-                                    int(circle_radius * 2),
-                                    int(circle_radius * 2)
-                                ],
-                                start_angle,
-                                end_angle,
-                                4  # Thickness of the arc
-                            )
-
-        self.draw_hud()  # Draw the HUD
-
-        far_bullets.sort(key=lambda x: x['depth'])  # Sort far bullets by depth
-        shallow_bullets.sort(key=lambda x: x['depth'])  # Sort shallow bullets by depth
-
-        # Draw far bullets first
-        #player_hitbox_color = (0, 0, 255)  # Default to blue for player hitbox
-        for obj_info in reversed(far_bullets):  # Reverse to draw background first
-            obj = obj_info['object']
-            obj.draw(self.screen)
-            '''
-            bullet_hitbox_radius = obj.get_collision_radius()
-            bullet_hitbox_rect = pygame.Rect(
-                bullet.position.x - bullet_hitbox_radius,
-                bullet.position.y - bullet_hitbox_radius,
-                bullet_hitbox_radius * 2,
-                bullet_hitbox_radius * 2
-            )
-            
-            # Draw bullet's hitbox (default yellow)
-            bullet_hitbox_color = (255, 255, 0)
-
-            # Calculate player's hitbox
-            player_radius = 5
-            player_hitbox_rect = pygame.Rect(
-                (WIDTH // 2) - player_radius, 
-                (HEIGHT // 2) - player_radius, 
-                player_radius * 2, 
-                player_radius * 2
-            )
-            
-            # Check for intersection of bullet and player hitboxes
-            if player_hitbox_rect.colliderect(bullet_hitbox_rect):
-                # Check if the depths are within range
-                depth_difference = abs(self.player.depth - obj.depth)
-                if depth_difference < BULLET_DEPTH_HIT_TOLERANCE:  # Check if bullet is within hit depth
-                    bullet_hitbox_color = (255, 255, 0)  # Change bullet hitbox color to yellow
-                    player_hitbox_color = (255, 255, 0)  # Change player hitbox color to yellow
-                    
-            pygame.draw.rect(self.screen, bullet_hitbox_color, bullet_hitbox_rect, 2)  # Draw bullet hitbox
-            '''
-            pass
-
-        # Draw all world objects (e.g., stars, enemies)
-        for obj_info in reversed(world_objects):  # Reverse to draw background first
-            obj = obj_info['object']
-            obj_type = obj_info['type']
-
-            if obj_type == 'star':
-                obj.draw(self.screen)
-                if obj_info['is_target']:
-                    box_size = max(1, int(obj.size / obj.depth)) * 8
-                    draw_box(self.screen, obj.position, box_size, TARGET_COLOR)
-            elif obj_type == 'enemy':
-                obj.draw(self.screen)
+            bullet.batched = bullet.depth > player_depth
+            if not bullet.batched:
+                near_queue.push(bullet.depth, bullet)
+
+        # Stars, enemies and far bullets share one persistent depth ordering around the
+        # player layer; it is repaired rather than re-sorted, and each object is drawn
+        # exactly once, farthest first
+        self.depth_index.repair(player_depth)
+        self.culler.begin_frame()
+        batch = self.batch
+        self.depth_index.emit(batch, self.culler)
+        self.flush_world(batch, rects)
 
         # Draw player flame if in "outward" scroll mode (BEHIND the ship)
         if self.player.scroll_mode == 'outward':
             ship_center = Vector2(WIDTH // 2, HEIGHT // 2)
             boosted_velocity = self.player.update_boost(0)
-            self.draw_flame(ship_center, self.player.direction, boosted_velocity)
+            mark(self.draw_flame(ship_center, self.player.direction, boosted_velocity))
 
         # Draw player ship (UI layer)
         spaceship_shape = SPACESHIP_SHAPES.get(self.player.direction, SPACESHIP_SHAPES["up"])
@@ -293,7 +243,7 @@ class Game:
         spaceship_height = len(spaceship_shape) * PIXEL_SIZE
         spaceship_position = ((WIDTH - spaceship_width) // 2, (HEIGHT - spaceship_height) // 2)
 
-        draw_spaceship(self.screen, spaceship_shape, spaceship_position)
+        mark(draw_spaceship(scene, spaceship_shape, spaceship_position))
         '''debug stuff
         # Draw player hitbox
         player_radius = 14
@@ -317,35 +267,82 @@ class Game:
         if self.player.scroll_mode != 'outward':
             ship_center = Vector2(WIDTH // 2, HEIGHT // 2)
             boosted_velocity = self.player.update_boost(0)
-            self.draw_flame(ship_center, self.player.direction, boosted_velocity)
+            mark(self.draw_flame(ship_center, self.player.direction, boosted_velocity))
 
         # Draw shallow bullets after the player
-        for obj_info in reversed(shallow_bullets):  # Reverse to draw background first
-            obj = obj_info['object']
-            obj.draw(self.screen)
-            '''
-            bullet_hitbox_radius = obj.get_collision_radius()
-            bullet_hitbox_rect = pygame.Rect(
-                bullet.position.x - bullet_hitbox_radius,
-                bullet.position.y - bullet_hitbox_radius,
-                bullet_hitbox_radius * 2,
-                bullet_hitbox_radius * 2
-            )
+        near_queue.emit(batch, self.culler)
+        self.flush_world(batch, rects)
+        self.trails.flush()  # This frame's trail stamps show from the next frame on
+
+        # A reduced-resolution scene is upscaled once; overlays and HUD are drawn at native resolution
+        if scene is not self.screen:
+            scene.present_to(self.screen)
+
+        # Overlay pass: health bars, target highlights and race markers are cached sprites
+        # submitted as one batch on top of the world layers, at native resolution; rings too
+        # large to cache (close targets) are drawn directly, in order, within that batch
+        overlay = self.batch
+        for enemy in self.enemies:
+            enemy.emit_overlay(overlay)
+
+        obj = self.target_enemy
+        if obj is not None and obj in self.enemies:  # Highlight targeted enemy
+            # Calculate radius of the target circle
+            circle_radius = max(20, 50 / obj.depth)  # Dynamic size based on depth
+
+            # Calculate player position (center of screen)
+            player_pos = Vector2(WIDTH // 2, HEIGHT // 2)
+
+            # Calculate distance from player to the enemy
+            distance_to_target = (obj.position - player_pos).length()
+
+            if obj in self.tagged_enemies:
+                # If the enemy is already tagged, draw a full green circle
+                add_ring(overlay, circle_radius, (0, 255, 0), obj.position)
+            else:
+                # Change color to green if the player is inside the circle, else red
+                circle_color = (0, 255, 0) if distance_to_target <= circle_radius else (255, 0, 0)
+                add_ring(overlay, circle_radius, circle_color, obj.position)
+
+                # Draw progress bar if within proximity
+                if distance_to_target <= circle_radius:
+                    progress_ratio = self.tag_timer / 1000.0  # Assuming tag_timer is in milliseconds
+                    add_arc(overlay, circle_radius, progress_ratio, (0, 255, 0), obj.position)
+
+        # Target box
+        if self.target_star is not None:
+            obj = self.target_star
+            box_size = max(1, int(obj.size / obj.depth)) * 8
+            add_centered(overlay, box_sprite(box_size, TARGET_COLOR), obj.position)
+
+        if self.race is not None:
+            self.race.emit_overlay(overlay)
+        overlay.flush(self.screen, rects)
+
+        self.draw_hud(rects)  # HUD goes on top of everything
+
+    def observe(self, size=OBSERVATION_SIZE):
+        """
+        Returns the current game state as a small RGB array for agents and playtesting.
+        Nothing is drawn to the display; see observation.py.
+
+        Args:
+            size (tuple): Observation (width, height), e.g. (160, 90).
+
+        Returns:
+            np.ndarray: (height, width, 3) uint8 frame, reused (and overwritten) by the next call.
+        """
+        if self.observer is None or (self.observer.width, self.observer.height) != tuple(size):
+            self.observer = ObservationRenderer(size)
+        return self.observer.render(self)
+
+    def flush_world(self, batch, rects=None):
+        """Draws a world batch onto the scene, split across render tiles when enabled."""
+        if self.tiles is not None:
+            self.tiles.flush(batch, rects)
+        else:
+            batch.flush(self.scene, rects)
 
-            # Draw bullet hitbox (yellow for visibility)
-            bullet_hitbox_color = (255, 255, 0)
-            pygame.draw.rect(self.screen, bullet_hitbox_color, bullet_hitbox_rect, 2)
-        
-            if player_hitbox_rect.colliderect(bullet_hitbox_rect):
-                depth_difference = abs(self.player.depth - obj.depth)
-                if depth_difference < BULLET_DEPTH_HIT_TOLERANCE:
-                    bullet_hitbox_color = (255, 255, 0)
-                    player_hitbox_color = (255, 255, 0)
-
-            #pygame.draw.rect(self.screen, bullet_hitbox_color, bullet_hitbox_rect, 2)  # Draw bullet hitbox
-            '''
-            pass
-        
     def handle_mouse_click(self, position):
         """
         Handles mouse clicks to select a target star.
@@ -359,8 +356,9 @@ class Game:
             bool: True if a star was clicked, False otherwise.
         """
         # Find all stars where the click is inside the star's visual radius
+        reach = max(1, int(STAR_MAX_SIZE / MIN_DEPTH))  # Largest radius any star can have
         clicked_stars = [
-            star for star in self.stars 
+            star for _, star in self.star_hash.query_radius(position, reach)
             if (star.position - position).length() <= max(1, int(star.size / star.depth))
         ]
         
@@ -381,104 +379,178 @@ class Game:
         return False
 
     def run(self):
-        racing = False
-        while self.running:
-            delta_time = self.clock.tick(60) / 1000.0  # Get time since last frame
-            player_position = Vector2(WIDTH // 2, HEIGHT // 2)  # Center of the screen (where player ship is)
-            player_depth = self.player.depth  # Get player's depth
-            self.delta_time = delta_time  # Store delta_time globally for use in lock-on logic
-
-            # Handle events and input
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_TAB:  # Cycle lock-on
-                        if event.mod & pygame.KMOD_SHIFT:
-                            self.cycle_target_enemy(forward=False)  # Cycle backward
-                        else:
-                            self.cycle_target_enemy(forward=True)  # Cycle forward
-                    elif event.key == pygame.K_f:  # Lock-on / auto-follow toggle
-                        if self.player.auto_follow_active:
-                            self.player.disable_auto_follow()
-                        else:
-                            if self.target_enemy and self.target_enemy in self.tagged_enemies:
-                                self.player.enable_auto_follow(self.target_enemy)
-                            else:
-                                print("Auto-Follow can only be enabled for tagged enemies.")
-                    elif event.key == pygame.K_r:
-                        # Start the King of the Hill race:
-                        self.race = RacingMode(self.player, self.enemies, self.screen)
-                        self.race.start_race()
-                        racing = True
-                        print("King of the Hill Mode activated!")
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:  # Left click
-                        clicked_position = Vector2(event.pos)
-                        self.handle_mouse_click(clicked_position)
-                    elif event.button == 3:  # Right click (remove lock-on)
-                        self.target_enemy = None
-                        self.target_star = None
+        """
+        Main loop: events once per frame, the simulation in fixed steps of
+        `timestep.dt` (as many as the elapsed time calls for), then one frame
+        drawn between the last two simulation states.
+        """
+        if self.headless:
+            raise RuntimeError("A headless Game has no display; drive it with step()")
+        try:
+            while self.running:
+                frame_time = self.clock.tick(self.frame_rate) / 1000.0  # Time since last frame
+                self.handle_events(frame_time)
+
+                for _ in range(self.timestep.advance(frame_time)):
+                    self.step(self.timestep.dt)
+
+                # === Render the Scene ===
+                render_start = time.perf_counter()
+                self.interpolator.apply(self.world_objects(), self.timestep.alpha)
+                self.draw_scene()
+                if self.race is not None:
+                    race_rects = []
+                    self.race.draw(race_rects)
+                    for rect in race_rects:
+                        self.backend.touch(rect)
+                    if self.dirty.enabled:
+                        self.dirty.extend(race_rects)
+                self.interpolator.restore()
+                self.backend.present(self.dirty)
+                self.render_times.append((time.perf_counter() - render_start) * 1000.0)
+                del self.render_times[:-120]
+        finally:
+            if self.tiles is not None:
+                self.tiles.shutdown()  # Join the render threads on the way out
+
+    def world_objects(self):
+        """Stars, enemies and bullets: everything the simulation moves and draw_scene interpolates."""
+        return itertools.chain(self.stars, self.enemies, self.bullets)
+
+    def handle_events(self, delta_time):
+        """
+        Handles window, keyboard and mouse events once per rendered frame.
+
+        Args:
+            delta_time (float): Seconds since the previous frame.
+        """
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_TAB:  # Cycle lock-on
+                    if event.mod & pygame.KMOD_SHIFT:
+                        self.cycle_target_enemy(forward=False)  # Cycle backward
+                    else:
+                        self.cycle_target_enemy(forward=True)  # Cycle forward
+                elif event.key == pygame.K_f:  # Lock-on / auto-follow toggle
+                    if self.player.auto_follow_active:
                         self.player.disable_auto_follow()
-                        self.tag_timer = 0  # Reset tagging timer
-                elif event.type == pygame.MOUSEWHEEL:
-                    self.player.handle_wheel(event.y, delta_time)
-                    
-            # === Player Input ===
-            depth_delta = self.center_zoom(delta_time)
-            depth_change = depth_delta
-            depth_change += self.player.handle_input(delta_time)
-            self.handle_continuous_fire()
-            self.player.update_scroll_mode()
-
-            if racing and self.race:
-                self.race.update(delta_time, self.player.velocity, depth_change)
-
-            # === Check Lock-on and Bullet Hits ===
-            self.check_proximity_to_target(delta_time)
-            #self.check_enemy_wrap()
-
-            # === Update All Game Objects ===
-            # Update player position, depth, and movement
-            boosted_velocity = self.player.update_boost(delta_time)
-            
-            # Update all stars
-            for star in self.stars:
-                star.update(boosted_velocity, depth_change, delta_time, star is self.target_star)
-            
-            # Update all bullets (player and enemy bullets)
-            for bullet in self.bullets:
-                bullet.update(delta_time)
-
-            # Update All Enemies
-            new_bullets = [] 
-            if racing and self.race:
-                checkpoint_pos = self.race.checkpoint_pos
-                checkpoint_depth = self.race.checkpoint_depth
-            else:
-                checkpoint_pos = None
-                checkpoint_depth = None
-
-            for enemy in self.enemies:
-                enemy.update(
-                    delta_time,
-                    self.player.depth,
-                    self.player.velocity,
-                    depth_change,
-                    global_depth_change=0,
-                    checkpoint_pos=checkpoint_pos,
-                    checkpoint_depth=checkpoint_depth
-                )
-                bullet = enemy.fire_bullets(Vector2(WIDTH // 2, HEIGHT // 2), player_depth, self.player.velocity, delta_time)
-                if bullet:
-                    new_bullets.append(bullet)
-            self.bullets.extend(new_bullets)  # Add newly fired bullets to bullet list
-            self.update_collisions()
-            # === Render the Scene ===
-            self.draw_scene()
-            if racing and self.race:
-                self.race.draw()
-            pygame.display.flip()
+                    else:
+                        if self.target_enemy and self.target_enemy in self.tagged_enemies:
+                            self.player.enable_auto_follow(self.target_enemy)
+                        else:
+                            print("Auto-Follow can only be enabled for tagged enemies.")
+                elif event.key == pygame.K_F2:
+                    self.toggle_dirty_rects()
+                elif event.key == pygame.K_r:
+                    # Start the King of the Hill race:
+                    self.race = RacingMode(self.player, self.enemies, self.screen, self.rng, self.enemy_hash)
+                    self.race.start_race()
+                    print("King of the Hill Mode activated!")
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1:  # Left click
+                    clicked_position = Vector2(event.pos)
+                    self.handle_mouse_click(clicked_position)
+                elif event.button == 3:  # Right click (remove lock-on)
+                    self.target_enemy = None
+                    self.target_star = None
+                    self.player.disable_auto_follow()
+                    self.tag_timer = 0  # Reset tagging timer
+            elif event.type == pygame.MOUSEWHEEL:
+                self.player.handle_wheel(event.y, delta_time)
+
+    def step(self, delta_time, inputs=None):
+        """
+        Advances the simulation by one step.
+
+        Args:
+            delta_time (float): Step length in seconds.
+            inputs (optional): Keys held during the step, as any collection of pygame
+                key codes (e.g. {pygame.K_w, pygame.K_SPACE} or [pygame.K_w]), a
+                pygame.key.get_pressed() state or a PressedKeys. Defaults to the
+                keyboard, or to no keys when headless.
+        """
+        if inputs is None:
+            keys_pressed = PressedKeys() if self.headless else pygame.key.get_pressed()
+        elif isinstance(inputs, KEY_STATE_TYPES):
+            keys_pressed = inputs
+        else:
+            keys_pressed = PressedKeys(inputs)
+        self.sim_clock.advance(delta_time)
+        # Pre-step state: drawn frames blend from it, and bullets sweep collisions from it
+        self.interpolator.save(self.world_objects())
+        player_depth = self.player.depth  # Get player's depth
+        self.delta_time = delta_time  # Store delta_time globally for use in lock-on logic
+
+        # === Player Input ===
+        depth_delta = self.center_zoom(delta_time)
+        depth_change = depth_delta
+        depth_change += self.player.handle_input(delta_time, keys_pressed)
+        self.handle_continuous_fire(keys_pressed)
+        self.player.update_scroll_mode()
+        self.enemy_hash.invalidate(self.enemies)  # Refiled by the first search of this step
+
+        if self.race is not None:
+            self.race.update(delta_time, self.player.velocity, depth_change)
+
+        # === Check Lock-on and Bullet Hits ===
+        self.check_proximity_to_target(delta_time)
+        #self.check_enemy_wrap()
+
+        # === Update All Game Objects ===
+        # Update player position, depth, and movement
+        boosted_velocity = self.player.update_boost(delta_time)
+        
+        # Update all stars
+        for star in self.stars:
+            star.update(boosted_velocity, depth_change, delta_time, star is self.target_star)
+        self.star_hash.invalidate(self.stars)  # Star positions are final for this step
+        
+        # Update all bullets (player and enemy bullets)
+        for bullet in self.bullets:
+            bullet.update(delta_time)
+
+        # Update All Enemies
+        new_bullets = [] 
+        if self.race is not None:
+            checkpoint_pos = self.race.checkpoint_pos
+            checkpoint_depth = self.race.checkpoint_depth
+        else:
+            checkpoint_pos = None
+            checkpoint_depth = None
+
+        for enemy in self.enemies:
+            enemy.update(
+                delta_time,
+                self.player.depth,
+                self.player.velocity,
+                depth_change,
+                global_depth_change=0,
+                checkpoint_pos=checkpoint_pos,
+                checkpoint_depth=checkpoint_depth
+            )
+            bullet = enemy.fire_bullets(Vector2(WIDTH // 2, HEIGHT // 2), player_depth, self.player.velocity, delta_time)
+            if bullet:
+                new_bullets.append(bullet)
+        self.bullets.extend(new_bullets)  # Add newly fired bullets to bullet list
+        self.depth_index.extend(new_bullets, relative=True)
+        self.update_collisions()
+
+    def supports_dirty_rects(self):
+        """Dirty rects need the surface backend drawing the world at full resolution."""
+        return self.backend is not None and self.backend.supports_dirty_rects and self.scene is self.screen
+
+    def toggle_dirty_rects(self):
+        """Switches between full-frame and dirty-rect presentation, reporting the render time so far."""
+        if not self.supports_dirty_rects():
+            print(f"Dirty rects are not available with the {self.backend.name} backend or a render scale.")
+            return
+        average = sum(self.render_times) / len(self.render_times) if self.render_times else 0.0
+        previous = "dirty rects" if self.dirty.enabled else "full frame"
+        mode = "dirty rects" if self.dirty.toggle() else "full frame"
+        self.render_times.clear()
+        print(f"Presentation: {mode} ({previous} averaged {average:.2f} ms per frame).")
             
     def check_enemy_wrap(self):
         """Check if the locked enemy wraps and lose lock if they do."""
@@ -516,63 +588,60 @@ class Game:
         """
         Checks every bullet for collisions with player or enemies and applies damage.
         Removes bullets and/or kills enemies if health drops to zero.
-        """
-        bullets_to_remove = []
-        enemies_to_remove = []
-
-        for bullet in self.bullets:
-            if not bullet.alive:
-                # Already flagged for removal in bullet.update() if out-of-bounds or expired
-                bullets_to_remove.append(bullet)
-                continue
-
-            # If it's an enemy bullet, check collision with player
-            if bullet.is_enemy_bullet:
-                if bullet.check_collision(self.player):
-                    # Apply damage to the player
-                    damage_amount = 1
-                    self.player.health -= damage_amount
-
-                    # Mark bullet for removal
-                    bullet.alive = False
-                    bullets_to_remove.append(bullet)
-
-                    # If player's health is depleted
-                    if self.player.health <= 0:
-                        print("Player is destroyed!")
-                        # Handle game-over logic here
-                    continue  # No need to check other collisions for this bullet
 
-            else:
-                # It's a player bullet, check collision with enemies
-                for enemy in self.enemies:
+        Every bullet is tested against every target in one broadcast
+        (collision.swept_hits); only the hits are then resolved in bullet order.
+        """
+        enemy_bullets = [bullet for bullet in self.bullets if bullet.is_enemy_bullet]
+        player_bullets = [bullet for bullet in self.bullets if not bullet.is_enemy_bullet]
+        # Bullets flagged in bullet.update() for leaving the screen or expiring during this
+        # step are removed below, but the path they travelled can still hit
+
+        # Enemy bullets against the player
+        if enemy_bullets:
+            player = SweptBodies([self.player], center=(WIDTH // 2, HEIGHT // 2))
+            hits = swept_hits(SweptBodies(enemy_bullets), player)
+            for index in np.flatnonzero(hits[:, 0]):
+                # Apply damage to the player and mark the bullet for removal
+                damage_amount = 1
+                self.player.health -= damage_amount
+                enemy_bullets[index].alive = False
+
+                # If player's health is depleted
+                if self.player.health <= 0:
+                    print("Player is destroyed!")
+                    # Handle game-over logic here
+
+        # Player bullets against the enemies: each bullet damages the first enemy
+        # (in list order) it hits that is still alive
+        if player_bullets and self.enemies:
+            hits = swept_hits(SweptBodies(player_bullets), SweptBodies(self.enemies))
+            for index in np.flatnonzero(hits.any(axis=1)):
+                for enemy_index in np.flatnonzero(hits[index]):
+                    enemy = self.enemies[enemy_index]
                     if not enemy.alive:
                         continue
-                    if bullet.check_collision(enemy):
-                        # Apply damage to the enemy
-                        damage_amount = 1  # Example
-                        enemy.health -= damage_amount
+                    # Apply damage to the enemy and mark the bullet for removal
+                    damage_amount = 1  # Example
+                    enemy.health -= damage_amount
+                    player_bullets[index].alive = False
 
-                        # Mark bullet for removal
-                        bullet.alive = False
-                        bullets_to_remove.append(bullet)
-
-                        # If enemy's health is depleted
-                        if enemy.health <= 0:
-                            enemy.alive = False
-                            enemies_to_remove.append(enemy)
-                        break  # Stop checking more enemies once bullet hits something
+                    # If enemy's health is depleted
+                    if enemy.health <= 0:
+                        enemy.alive = False
+                    break  # Stop checking more enemies once bullet hits something
 
         # Remove dead bullets
-        self.bullets = [b for b in self.bullets if b.alive and b not in bullets_to_remove]
+        self.depth_index.discard(b for b in self.bullets if not b.alive)
+        self.bullets = [b for b in self.bullets if b.alive]
 
         # Remove dead enemies
-        self.enemies = [e for e in self.enemies if e.alive and e not in enemies_to_remove]
+        self.depth_index.discard(e for e in self.enemies if not e.alive)
+        self.enemies = [e for e in self.enemies if e.alive]
     
-    def handle_continuous_fire(self):
+    def handle_continuous_fire(self, keys_pressed):
         """Fires a bullet every x milliseconds if the spacebar is held"""
-        keys_pressed = pygame.key.get_pressed()
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_clock.ticks
 
         if keys_pressed[pygame.K_SPACE]:
             if current_time - self.last_shot_time >= self.fire_delay:
@@ -595,9 +664,11 @@ class Game:
             self.player.depth, 
             spaceship_width, 
             spaceship_height, 
-            self.player.velocity
+            self.player.velocity,
+            clock=self.sim_clock
         )
         self.bullets.append(bullet)
+        self.depth_index.add(bullet, relative=True)
          
     def draw_flame(self, ship_center, direction, boosted_velocity):
         """
@@ -607,10 +678,13 @@ class Game:
             ship_center (Vector2): The center position of the ship.
             direction (str): The current direction the ship is facing (e.g., "up", "left", "down", etc.).
             boosted_velocity (Vector2): The velocity vector of the player's boost.
+
+        Returns:
+            pygame.Rect or None: Area drawn, or None when the ship is idle.
         """
         speed = boosted_velocity.length()
         if speed < 0.1:  # If the player isn't moving, no need to draw the flame
-            return
+            return None
 
         # Get the base direction and its corresponding vector
         base_direction = direction.split('_')[0] if '_' in direction else direction
@@ -626,34 +700,14 @@ class Game:
         else:
             ship_offset = dir_vector * -5  # Standard offset for other modes
 
-        flame_direction = -dir_vector  # Flame points in the opposite direction of the ship's movement
-
-        segments = 20  # Number of segments in the flame
-        current_time = pygame.time.get_ticks()  # Get current time for wave effects
-
-        for i in range(segments):
-            t = i / segments  # This defines the distance along the flame (from 0 to 1)
-
-            # Sinusoidal wave to give the flame a "flickering" effect
-            wave_offset = math.sin(current_time * 0.005 + i) * 2  # Wavy flicker effect
-            segment_pos = (
-                ship_center
-                + ship_offset  # Offset flame behind ship
-                + flame_direction * (flame_length * t) 
-                + Vector2(wave_offset, 0)
-            )
-
-            # Color gradient from cyan (0,255,255) to blue (0,0,255) as you move away from the ship
-            r = 0
-            g = int(255 - (255 * t))  # Green decreases as distance increases
-            b = 255  # Blue remains constant
-            color = (r, g, b)
-
-            # Flame size gets smaller further from the ship (radius shrinks as t increases)
-            radius = int(5 - 3 * t)
-
-            # Draw the flame segment as a small circle
-            pygame.draw.circle(self.screen, color, (int(segment_pos.x), int(segment_pos.y)), radius)
+        flame_start = ship_center + ship_offset  # Offset flame behind ship
+        drawn = self.flame.draw(self.scene, base_direction, flame_length, self.sim_clock.ticks, flame_start)
+        if self.additive_glow:
+            light, center = light_sprite(FLAME_LIGHT_COLOR, flame_length / 2 + FLAME_LIGHT_PADDING)
+            light_center = flame_start - dir_vector * (flame_length / 2)
+            drawn = drawn.union(self.scene.blit(light, (int(light_center.x) - center, int(light_center.y) - center),
+                                                None, pygame.BLEND_RGB_ADD))
+        return drawn
 
     def center_zoom(self, delta_time):
         """
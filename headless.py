@@ -0,0 +1,47 @@
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # pygame.init() must not need a display
+
+import pygame
+from game import Game
+from constants import SIMULATION_RATE
+
+INPUT_KEYS = [pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_SPACE]
+
+def random_inputs(rng, hold):
+    """Yields random held-key sets, each kept for `hold` steps."""
+    while True:
+        keys = {key for key in INPUT_KEYS if rng.random() < 0.3}
+        for _ in range(hold):
+            yield keys
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pulse Vector headless simulation")
+    parser.add_argument("--steps", type=int, default=10000,
+                        help="simulation steps to run")
+    parser.add_argument("--simulation-rate", type=float, default=SIMULATION_RATE,
+                        help="simulation steps per simulated second (step length 1 / rate)")
+    parser.add_argument("--inputs", choices=["idle", "random"], default="random",
+                        help="no keys held, or random WASD/space presses")
+    parser.add_argument("--hold", type=int, default=30,
+                        help="steps each random key set is held")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the world and the random inputs")
+    args = parser.parse_args()
+
+    game = Game(headless=True, seed=args.seed)
+    dt = 1.0 / args.simulation_rate
+    inputs = random_inputs(random.Random(args.seed), args.hold) if args.inputs == "random" else None
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        game.step(dt, next(inputs) if inputs is not None else None)
+    elapsed = time.perf_counter() - start
+
+    simulated = args.steps * dt
+    print(f"{args.steps} steps ({simulated:.1f} s simulated) in {elapsed:.2f} s: "
+          f"{args.steps / elapsed:.0f} steps/s, {simulated / elapsed:.1f}x real time")
+    pygame.quit()
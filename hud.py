@@ -0,0 +1,192 @@
+# hud.py
+
+import pygame
+from constants import *
+from sprite_cache import SpriteCache
+
+HUD_FONT_SIZE = 36
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+
+_FONTS = {}
+TEXT_CACHE = SpriteCache(256, name="hud_text")
+_GLYPH_ATLASES = {}
+
+def get_font(size):
+    """Returns the default SysFont at `size`, resolving it only once per size."""
+    font = _FONTS.get(size)
+    if font is None:
+        font = pygame.font.SysFont(None, size)
+        _FONTS[size] = font
+    return font
+
+def render_text(text, size, color):
+    """
+    Returns an antialiased text surface, memoized by (text, size, color).
+
+    Args:
+        text (str): Text to render.
+        size (int): Font size.
+        color (tuple): RGB text color.
+    """
+    return TEXT_CACHE.get((text, size, color), lambda: get_font(size).render(text, True, color))
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs for text that changes every frame, such as counters and
+    depth readouts. Composing a string is a handful of blits instead of a font
+    render, and nothing is allocated per value.
+    """
+    CHARACTERS = "0123456789.-+/:= "
+
+    def __init__(self, size, color):
+        """
+        Args:
+            size (int): Font size.
+            color (tuple): RGB text color.
+        """
+        font = get_font(size)
+        self.glyphs = {char: font.render(char, True, color) for char in self.CHARACTERS}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def supports(self, text):
+        """True when every character of `text` is in the atlas."""
+        return all(char in self.glyphs for char in text)
+
+    def width(self, text):
+        """Returns the pixel width of `text` composed from the atlas."""
+        glyphs = self.glyphs
+        return sum(glyphs[char].get_width() for char in text)
+
+    def blit(self, surface, text, position):
+        """
+        Blits `text` glyph by glyph with its top-left at `position`.
+
+        Returns:
+            int: Width drawn in pixels.
+        """
+        glyphs = self.glyphs
+        x, y = position
+        start_x = x
+        sprites = []
+        for char in text:
+            glyph = glyphs[char]
+            sprites.append((glyph, (x, y)))
+            x += glyph.get_width()
+        surface.blits(sprites, doreturn=False)
+        return x - start_x
+
+def get_glyph_atlas(size, color):
+    """Returns the shared GlyphAtlas for (size, color), building it on first use."""
+    atlas = _GLYPH_ATLASES.get((size, color))
+    if atlas is None:
+        atlas = GlyphAtlas(size, color)
+        _GLYPH_ATLASES[(size, color)] = atlas
+    return atlas
+
+def blit_label(surface, label, value, size, color, position):
+    """
+    Blits a static label from the text cache followed by a changing value from the
+    glyph atlas (falling back to the text cache for characters the atlas lacks).
+
+    Returns:
+        int: Total width drawn in pixels.
+    """
+    label_surface = render_text(label, size, color)
+    surface.blit(label_surface, position)
+    x = position[0] + label_surface.get_width()
+    atlas = get_glyph_atlas(size, color)
+    if atlas.supports(value):
+        return x + atlas.blit(surface, value, (x, position[1])) - position[0]
+    value_surface = render_text(value, size, color)
+    surface.blit(value_surface, (x, position[1]))
+    return x + value_surface.get_width() - position[0]
+
+def label_width(label, value, size, color):
+    """Width blit_label would draw for the same arguments."""
+    atlas = get_glyph_atlas(size, color)
+    value_width = atlas.width(value) if atlas.supports(value) else render_text(value, size, color).get_width()
+    return render_text(label, size, color).get_width() + value_width
+
+class HUD:
+    """
+    Retained-mode HUD: player health, tagged-enemy count, auto-pilot and lock-on status
+    are composited into one cached RLE surface that is only re-rendered when a
+    displayed value changes. A frame without changes costs a single blit.
+    """
+
+    def __init__(self, size=(WIDTH, HEIGHT)):
+        self.size = size
+        self.surface = None
+        self.state = None
+        self.renders = 0
+        self.rects = []  # Bounding rect of each HUD element, for dirty-rect presentation
+
+    def draw(self, target, health, max_health, tagged_count, total_enemies, auto_follow, target_type, rects=None):
+        """
+        Blits the HUD onto `target`, re-compositing it first if any value changed.
+
+        Args:
+            target (pygame.Surface): Surface to draw onto.
+            health (int): Player health.
+            max_health (int): Player maximum health.
+            tagged_count (int): Number of tagged enemies.
+            total_enemies (int): Number of live enemies.
+            auto_follow (bool): Whether auto-pilot is following a tagged enemy.
+            target_type (str or None): Type of the locked-on target, if any.
+            rects (list, optional): Receives the element rects that were drawn.
+        """
+        state = (health, max_health, tagged_count, total_enemies, auto_follow, target_type)
+        if state != self.state:
+            self.state = state
+            self.surface = self._render(*state)
+            self.renders += 1
+        target.blit(self.surface, (0, 0))
+        if rects is not None:
+            rects.extend(self.rects)
+
+    def _render(self, health, max_health, tagged_count, total_enemies, auto_follow, target_type):
+        width, height = self.size
+        surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        size = HUD_FONT_SIZE
+
+        # 1. **Player Health Bar (Top-Left)**
+        player_health_ratio = health / max_health
+        health_bar_width = 200
+        health_bar_height = 20
+        health_bar_x = 10
+        health_bar_y = 10
+        surface.fill(RED, (health_bar_x, health_bar_y, health_bar_width, health_bar_height))  # Red border
+        surface.fill(GREEN, (health_bar_x, health_bar_y, max(0, int(health_bar_width * player_health_ratio)), health_bar_height))  # Green fill
+        health_text_width = blit_label(surface, "Health: ", f"{health} / {max_health}", size, WHITE,
+                   (health_bar_x, health_bar_y + health_bar_height + 5))  # Slightly below health bar
+
+        # 2. **Tagged Enemies Count (Top-Center)**
+        tagged_value = f"{tagged_count} / {total_enemies}"
+        tagged_width = label_width("Tagged Enemies: ", tagged_value, size, WHITE)
+        blit_label(surface, "Tagged Enemies: ", tagged_value, size, WHITE, (width // 2 - tagged_width // 2, 10))  # Centered at the top
+
+        # 3. **Auto-Follow Status (Bottom-Left)**
+        if auto_follow:
+            follow_surface = render_text("Auto-pilot: ON", size, GREEN)
+        else:
+            follow_surface = render_text("Auto-pilot: OFF", size, RED)
+        surface.blit(follow_surface, (10, height - 50))  # Bottom-left corner
+
+        # 4. **Lock-On Status (Bottom-Center)**
+        if target_type is not None:
+            lock_status_surface = render_text(f"Target: {target_type}", size, GREEN)
+        else:
+            lock_status_surface = render_text("No Target", size, RED)
+        surface.blit(lock_status_surface, (width // 2 - lock_status_surface.get_width() // 2, height - 50))  # Bottom-center
+
+        self.rects = [
+            pygame.Rect(health_bar_x, health_bar_y, max(health_bar_width, health_text_width),
+                        health_bar_height + 5 + size),
+            pygame.Rect(width // 2 - tagged_width // 2, 10, tagged_width, size),
+            follow_surface.get_rect(topleft=(10, height - 50)),
+            lock_status_surface.get_rect(topleft=(width // 2 - lock_status_surface.get_width() // 2, height - 50)),
+        ]
+        surface.set_alpha(255, pygame.RLEACCEL)  # Mostly transparent: RLE makes the per-frame blit nearly free
+        return surface
@@ -0,0 +1,71 @@
+# lighting.py
+
+import numpy as np
+import pygame
+from constants import *
+from sprite_cache import SpriteCache
+
+LIGHT_INTENSITY = 0.6        # Peak brightness of a falloff sprite, as a fraction of its color
+LIGHT_INTENSITY_STEPS = 16   # Distinct intensity levels baked per color and radius
+LIGHT_FALLOFF_POWER = 1.0    # Brightness falls off as (1 - d / radius) ** power
+LIGHT_CACHE = SpriteCache(2048, name="light")
+
+def build_light_sprite(color, radius, intensity):
+    """
+    Bakes a radial falloff sprite for additive blending.
+
+    Args:
+        color (tuple): RGB light color.
+        radius (int): Radius in pixels.
+        intensity (float): Peak brightness at the center, 0..1.
+
+    Returns:
+        pygame.Surface: Opaque RGB sprite of size (2 * radius + 1); black is "no light".
+    """
+    offsets = np.arange(-radius, radius + 1, dtype=np.float32) / radius
+    distance = np.sqrt(offsets[:, None] ** 2 + offsets[None, :] ** 2)
+    falloff = np.clip(1.0 - distance, 0.0, 1.0) ** LIGHT_FALLOFF_POWER * intensity
+    pixels = (falloff[:, :, None] * np.array(color[:3], dtype=np.float32)).astype(np.uint8)
+    return to_light_sprite(pygame.surfarray.make_surface(pixels))
+
+def to_light_sprite(surface):
+    """
+    Flattens a sprite onto black for additive blending.
+
+    An alpha sprite drawn over black and then added with BLEND_RGB_ADD looks
+    the same as the alpha sprite on the black sky, but the blit skips the
+    per-pixel alpha math; over other objects the light brightens them (bloom).
+
+    Args:
+        surface (pygame.Surface): Sprite, with or without per-pixel alpha.
+
+    Returns:
+        pygame.Surface: Opaque RGB sprite in the display format when there is one.
+    """
+    sprite = pygame.Surface(surface.get_size())
+    sprite.blit(surface, (0, 0))
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        sprite = sprite.convert()
+    return sprite
+
+def light_sprite(color, radius, intensity=LIGHT_INTENSITY):
+    """
+    Returns a cached falloff sprite for a light and the offset of its center.
+
+    Blit it with BLEND_RGB_ADD, at the light position minus the offset.
+
+    Args:
+        color (tuple): RGB color.
+        radius (float): Falloff radius in pixels.
+        intensity (float): Peak brightness, 0..1; snapped to LIGHT_INTENSITY_STEPS.
+
+    Returns:
+        tuple: (surface, center).
+    """
+    radius = int(radius + 0.5) or 1
+    level = max(1, min(LIGHT_INTENSITY_STEPS, int(intensity * LIGHT_INTENSITY_STEPS + 0.5)))
+    sprite = LIGHT_CACHE.get(
+        (color, radius, level),
+        lambda: build_light_sprite(color, radius, level / LIGHT_INTENSITY_STEPS)
+    )
+    return sprite, radius
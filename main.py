@@ -1,4 +1,23 @@
+import argparse
 from game import Game
+from render_backend import RENDER_BACKENDS
+from constants import RENDER_BACKEND, RENDER_SCALE, RENDER_THREADS, ADDITIVE_GLOW, SIMULATION_RATE, FRAME_RATE
 
 if __name__ == "__main__":
-    Game().run()
+    parser = argparse.ArgumentParser(description="Pulse Vector")
+    parser.add_argument("--backend", choices=RENDER_BACKENDS, default=RENDER_BACKEND,
+                        help="render backend: software surfaces or an SDL2 Renderer with textures")
+    parser.add_argument("--render-scale", type=float, default=RENDER_SCALE,
+                        help="draw the world at this fraction of the screen resolution, e.g. 0.5")
+    parser.add_argument("--additive-glow", action="store_true", default=ADDITIVE_GLOW,
+                        help="draw star, bullet and flame glow as additive light sprites (bloom) "
+                             "instead of alpha-blended sprites")
+    parser.add_argument("--render-threads", type=int, default=RENDER_THREADS,
+                        help="draw the world as this many horizontal tiles on a thread pool (surface backend)")
+    parser.add_argument("--simulation-rate", type=float, default=SIMULATION_RATE,
+                        help="fixed simulation steps per second")
+    parser.add_argument("--fps", type=int, default=FRAME_RATE,
+                        help="rendered frames per second cap, 0 for uncapped (frames interpolate between steps)")
+    args = parser.parse_args()
+    Game(backend=args.backend, render_scale=args.render_scale, additive_glow=args.additive_glow,
+         render_threads=args.render_threads, simulation_rate=args.simulation_rate, frame_rate=args.fps).run()
@@ -0,0 +1,125 @@
+# observation.py
+
+import numpy as np
+from constants import WIDTH, HEIGHT, MIN_DEPTH
+import spaceship
+
+OBSERVATION_SIZE = (160, 90)   # Default observation resolution (width, height)
+OBSERVATION_MAX_RADIUS = 8     # Largest disc splatted for one object, in observation pixels
+PLAYER_RADIUS = 14             # Player hitbox radius in screen pixels
+PLAYER_COLOR = (57, 255, 20)
+CHECKPOINT_COLOR = (255, 255, 0)
+SHIP_EXTENT = len(spaceship.SPACESHIP_SHAPES["up"][0]) * spaceship.PIXEL_SIZE  # Ship sprite size at scale 1
+
+def _positions(objects):
+    count = len(objects)
+    xs = np.fromiter((obj.position.x for obj in objects), dtype=np.float32, count=count)
+    ys = np.fromiter((obj.position.y for obj in objects), dtype=np.float32, count=count)
+    depths = np.fromiter((obj.depth for obj in objects), dtype=np.float32, count=count)
+    return xs, ys, depths
+
+def _colors(objects, color):
+    return np.array([color(obj)[:3] for obj in objects], dtype=np.uint8).reshape(-1, 3)
+
+class ObservationRenderer:
+    """
+    Renders the game state into a small RGB NumPy array for agents and
+    automated playtesting, without touching the display or any Surface.
+
+    Every object type is projected in bulk: positions and depths are gathered
+    into arrays, scaled from screen to observation pixels and sized by depth
+    with the same parallax the game draws with (star radius size / depth^0.7,
+    ship scale clamped 1 / depth, checkpoint at position / depth as in
+    RacingMode). Each type is then splatted as filled discs in one vectorized
+    write, far stars first, so nearer objects win. The frame array is
+    preallocated and reused.
+    """
+
+    def __init__(self, size=OBSERVATION_SIZE):
+        """
+        Args:
+            size (tuple): Observation (width, height) in pixels.
+        """
+        self.width, self.height = size
+        self.frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self.scale_x = self.width / WIDTH
+        self.scale_y = self.height / HEIGHT
+        self.scale = min(self.scale_x, self.scale_y)  # Radii scale
+        offsets = np.arange(-OBSERVATION_MAX_RADIUS, OBSERVATION_MAX_RADIUS + 1)
+        self.offset_x = offsets[None, None, :]
+        self.offset_y = offsets[None, :, None]
+        self.offset_d2 = self.offset_x ** 2 + self.offset_y ** 2
+        self.grid_y, self.grid_x = np.mgrid[0:self.height, 0:self.width]
+
+    def splat(self, xs, ys, radii, colors):
+        """
+        Draws filled discs; later discs overwrite earlier ones.
+
+        Args:
+            xs, ys (np.ndarray): Centers in screen pixels.
+            radii (np.ndarray): Radii in screen pixels (at least one observation pixel is drawn).
+            colors (np.ndarray): (n, 3) uint8 colors, or one (3,) color for all.
+        """
+        if not len(xs):
+            return
+        cx = np.rint(xs * self.scale_x).astype(np.int32)[:, None, None]
+        cy = np.rint(ys * self.scale_y).astype(np.int32)[:, None, None]
+        r = np.minimum(radii * self.scale, OBSERVATION_MAX_RADIUS)[:, None, None]
+        px, py = np.broadcast_arrays(cx + self.offset_x, cy + self.offset_y)
+        mask = ((self.offset_d2 <= r * r) | (self.offset_d2 == 0)) \
+            & (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+        index = np.nonzero(mask)[0]
+        colors = np.asarray(colors, dtype=np.uint8)
+        self.frame[py[mask], px[mask]] = colors[index] if colors.ndim == 2 else colors
+
+    def ring(self, x, y, radius, color, width=1.0):
+        """Draws one circle outline, evaluated over the whole frame (any radius)."""
+        d = np.hypot(self.grid_x - x * self.scale_x, self.grid_y - y * self.scale_y)
+        r = radius * self.scale
+        self.frame[(d <= r + width / 2) & (d >= r - width / 2)] = color
+
+    def render(self, game):
+        """
+        Renders `game` into the reused frame.
+
+        Args:
+            game (Game): Game whose stars, enemies, bullets, race and player are drawn.
+
+        Returns:
+            np.ndarray: (height, width, 3) uint8 RGB frame; overwritten by the next call.
+        """
+        self.frame.fill(0)
+
+        race = game.race
+        if race is not None and race.race_active:
+            x, y, radius = race.checkpoint_screen()
+            self.ring(x, y, radius, CHECKPOINT_COLOR)
+
+        stars = game.stars
+        if stars:
+            xs, ys, depths = _positions(stars)
+            sizes = np.fromiter((star.size for star in stars), dtype=np.float32, count=len(stars))
+            radii = np.maximum(1.0, sizes / np.power(np.maximum(depths, MIN_DEPTH), 0.7))
+            order = np.argsort(-depths, kind='stable')  # Farthest first
+            colors = _colors(stars, lambda star: star.color)
+            self.splat(xs[order], ys[order], radii[order], colors[order])
+
+        enemies = game.enemies
+        if enemies:
+            xs, ys, depths = _positions(enemies)
+            extent = SHIP_EXTENT * np.clip(1.0 / np.maximum(depths, MIN_DEPTH), 0.5, 1.5)
+            order = np.argsort(-depths, kind='stable')
+            colors = _colors(enemies, lambda enemy: enemy.get_shade_color())
+            # Enemy positions are the sprite's top-left corner
+            self.splat((xs + extent / 2)[order], (ys + extent / 2)[order], (extent / 2)[order], colors[order])
+
+        bullets = game.bullets
+        if bullets:
+            xs, ys, depths = _positions(bullets)
+            radii = np.fromiter((bullet.size for bullet in bullets), dtype=np.float32, count=len(bullets))
+            order = np.argsort(-depths, kind='stable')
+            colors = _colors(bullets, lambda bullet: bullet.color)
+            self.splat(xs[order], ys[order], radii[order], colors[order])
+
+        self.splat(np.array([WIDTH / 2]), np.array([HEIGHT / 2]), np.array([PLAYER_RADIUS]), PLAYER_COLOR)
+        return self.frame
@@ -0,0 +1,152 @@
+# overlay.py
+
+import math
+import pygame
+from pygame.math import Vector2
+from constants import *
+from sprite_cache import SpriteCache, finalize_sprite
+from utils import draw_box
+
+OVERLAY_RADIUS_STEP = 2    # Ring and arc radii are baked in buckets of this many pixels
+ARC_PROGRESS_STEPS = 60    # Distinct fill levels of a progress arc
+OVERLAY_MAX_BAKED_RADIUS = 320  # Larger rings and arcs (close targets) are drawn directly, clipped to the screen
+OVERLAY_CACHE_BYTES = 32 * 1024 * 1024  # Pixel budget of the overlay cache; ring sprites grow with radius squared
+OVERLAY_CACHE = SpriteCache(1024, name="overlay", max_bytes=OVERLAY_CACHE_BYTES)
+
+def radius_bucket(radius):
+    """Snaps a radius to OVERLAY_RADIUS_STEP, never below one step."""
+    return max(1, int(round(radius / OVERLAY_RADIUS_STEP))) * OVERLAY_RADIUS_STEP
+
+def arc_steps(progress):
+    """Snaps a 0..1 progress fraction to a whole number of ARC_PROGRESS_STEPS."""
+    return int(min(max(progress, 0.0), 1.0) * ARC_PROGRESS_STEPS)
+
+def draw_arc(surface, rect, steps, color, width):
+    """Draws a clockwise arc of `steps` ARC_PROGRESS_STEPS from 12 o'clock and returns its rect."""
+    start_angle = -math.pi / 2  # Start at the top
+    end_angle = start_angle + 2 * math.pi * steps / ARC_PROGRESS_STEPS
+    return pygame.draw.arc(surface, color, rect, start_angle, end_angle, width)
+
+def ring_sprite(radius, color, width=2):
+    """
+    Returns a cached ring (circle outline) sprite and the offset of its center.
+
+    Use `add_ring` for radii that may exceed OVERLAY_MAX_BAKED_RADIUS.
+
+    Args:
+        radius (float): Ring radius in pixels; snapped to OVERLAY_RADIUS_STEP.
+        color (tuple): RGB color.
+        width (int): Line width.
+
+    Returns:
+        tuple: (surface, center) with center the ring center inside the sprite.
+    """
+    radius = radius_bucket(radius)
+
+    def build():
+        surface = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (radius, radius), radius, width)
+        return finalize_sprite(surface)
+
+    return OVERLAY_CACHE.get(("ring", radius, color, width), build), radius
+
+def arc_sprite(radius, progress, color, width=4):
+    """
+    Returns a cached clockwise progress arc starting at 12 o'clock.
+
+    Use `add_arc` for radii that may exceed OVERLAY_MAX_BAKED_RADIUS.
+
+    Args:
+        radius (float): Arc radius in pixels; snapped to OVERLAY_RADIUS_STEP.
+        progress (float): Filled fraction, 0..1; snapped to ARC_PROGRESS_STEPS.
+        color (tuple): RGB color.
+        width (int): Line width.
+
+    Returns:
+        tuple or None: (surface, center) as for ring_sprite, or None when nothing is filled.
+    """
+    steps = arc_steps(progress)
+    if steps <= 0:
+        return None
+    radius = radius_bucket(radius)
+
+    def build():
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        draw_arc(surface, (0, 0, radius * 2, radius * 2), steps, color, width)
+        return finalize_sprite(surface)
+
+    return OVERLAY_CACHE.get(("arc", radius, steps, color, width), build), radius
+
+def box_sprite(size, color, thickness=2):
+    """
+    Returns a cached target box (corner brackets, as utils.draw_box) and its center.
+
+    Args:
+        size (int): Box size in pixels.
+        color (tuple): RGB color.
+        thickness (int): Line thickness.
+    """
+    center = size // 2 + thickness
+
+    def build():
+        surface = pygame.Surface((center * 2 + 1, center * 2 + 1), pygame.SRCALPHA)
+        draw_box(surface, Vector2(center, center), size, color, thickness)
+        return finalize_sprite(surface)
+
+    return OVERLAY_CACHE.get(("box", size, color, thickness), build), center
+
+def add_centered(batch, sprite_and_center, position):
+    """Queues a (sprite, center) pair from this module centered on `position`."""
+    if sprite_and_center is None:
+        return
+    sprite, center = sprite_and_center
+    batch.add(sprite, (int(position[0]) - center, int(position[1]) - center))
+
+def _touched(target, rect):
+    # Canvases that mirror their pixels into a renderer need to know what changed
+    touch = getattr(target, "touch", None)
+    if touch is not None and rect.w and rect.h:
+        touch(rect)
+    return rect
+
+def add_ring(batch, radius, color, position, width=2):
+    """
+    Queues a ring centered on `position`: a cached sprite up to OVERLAY_MAX_BAKED_RADIUS,
+    above it a circle drawn straight onto the target, which pygame clips to the screen.
+
+    Args:
+        batch (SpriteBatch): Overlay batch.
+        radius (float): Ring radius in pixels.
+        color (tuple): RGB color.
+        position (tuple): Ring center on screen.
+        width (int): Line width.
+    """
+    if radius_bucket(radius) <= OVERLAY_MAX_BAKED_RADIUS:
+        add_centered(batch, ring_sprite(radius, color, width), position)
+        return
+    center = (int(position[0]), int(position[1]))
+    radius = int(radius)
+    batch.add_draw(lambda target: _touched(target, pygame.draw.circle(target, color, center, radius, width)))
+
+def add_arc(batch, radius, progress, color, position, width=4):
+    """
+    Queues a progress arc (as arc_sprite) centered on `position`, drawn directly
+    above OVERLAY_MAX_BAKED_RADIUS like add_ring.
+
+    Args:
+        batch (SpriteBatch): Overlay batch.
+        radius (float): Arc radius in pixels.
+        progress (float): Filled fraction, 0..1.
+        color (tuple): RGB color.
+        position (tuple): Arc center on screen.
+        width (int): Line width.
+    """
+    if radius_bucket(radius) <= OVERLAY_MAX_BAKED_RADIUS:
+        add_centered(batch, arc_sprite(radius, progress, color, width), position)
+        return
+    steps = arc_steps(progress)
+    if steps <= 0:
+        return
+    radius = int(radius)
+    rect = (int(position[0]) - radius, int(position[1]) - radius, radius * 2, radius * 2)
+    batch.add_draw(lambda target: _touched(target, draw_arc(target, rect, steps, color, width)))
@@ -92,17 +92,20 @@ class Player:
         self.auto_follow_target = None
         print("Auto-Follow disabled.")
 
-    def handle_input(self, delta_time):
+    def handle_input(self, delta_time, keys_pressed=None):
         """
         Handles player input for movement, direction, and auto-follow.
 
         Args:
             delta_time (float): Time elapsed since the last frame.
+            keys_pressed (optional): Key state indexed by pygame key codes;
+                defaults to pygame.key.get_pressed().
 
         Returns:
             float: Depth change applied during this frame.
         """
-        keys_pressed = pygame.key.get_pressed()
+        if keys_pressed is None:
+            keys_pressed = pygame.key.get_pressed()
         depth_change = 0.0
 
         # Check for manual movement input
@@ -166,7 +169,7 @@ class Player:
             base_direction = self.last_direction
 
         # Determine current direction based on input
-        current_direction = get_direction(pygame.key.get_pressed(), BASE_DIRECTION_MAP)
+        current_direction = get_direction(keys_pressed, BASE_DIRECTION_MAP)
 
         # Update last_direction if there's manual input
         if current_direction:
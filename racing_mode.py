@@ -3,13 +3,16 @@ import random
 import math
 from pygame.math import Vector2
 from constants import WIDTH, HEIGHT, MIN_DEPTH, MAX_DEPTH
+from hud import render_text, blit_label, label_width
+from overlay import add_ring, add_arc
+from spatial_hash import SpatialHash
 
 CAPTURE_RADIUS = 200           # Radius within which a ship can capture the checkpoint
 CAPTURE_TIME_REQUIRED = 0.5   # 0.5 seconds needed to capture
 WIN_SCORE = 3                 # First to 3 captures wins
 
 class RacingMode:
-    def __init__(self, player, enemies, screen):
+    def __init__(self, player, enemies, screen, rng=random, enemy_hash=None):
         """
         Initializes the King of the Hill racing mode with one shared checkpoint.
         
@@ -17,7 +20,12 @@ class RacingMode:
             player (Player): The player object.
             enemies (list): List of enemy ship objects.
             screen (pygame.Surface): The game screen surface for drawing.
+            rng (random.Random): Random source for checkpoint placement; the `random` module by default.
+            enemy_hash (SpatialHash, optional): The game's per-frame index of `enemies`;
+                built on the spot when not given.
         """
+        self.rng = rng
+        self.enemy_hash = enemy_hash
         self.player = player
         self.enemies = enemies
         self.screen = screen
@@ -40,9 +48,9 @@ class RacingMode:
 
     def respawn_checkpoint(self):
         """Randomly place the shared checkpoint at a new 3D location (world space)."""
-        x = random.uniform(0, WIDTH)
-        y = random.uniform(0, HEIGHT)
-        depth = random.uniform(MIN_DEPTH, MAX_DEPTH)
+        x = self.rng.uniform(0, WIDTH)
+        y = self.rng.uniform(0, HEIGHT)
+        depth = self.rng.uniform(MIN_DEPTH, MAX_DEPTH)
         self.checkpoint_pos = Vector2(x, y)
         self.checkpoint_depth = depth
         self.current_controller = None
@@ -97,54 +105,71 @@ class RacingMode:
         if player_dist <= CAPTURE_RADIUS and depth_diff_player < 0.2:
             return "player"
 
-        for i, enemy in enumerate(self.enemies):
+        enemy_hash = self.enemy_hash if self.enemy_hash is not None else SpatialHash.build(self.enemies)
+        # Wrap-around candidates near the checkpoint, in list order; the direct distance decides
+        for _, enemy in enemy_hash.query_radius(self.checkpoint_pos, CAPTURE_RADIUS, self.checkpoint_depth, 0.2):
             dist = (enemy.position - self.checkpoint_pos).length()
             depth_diff_enemy = abs(enemy.depth - self.checkpoint_depth)
             if dist <= CAPTURE_RADIUS and depth_diff_enemy < 0.2:
-                return f"enemy_{i}"
+                return f"enemy_{self.enemies.index(enemy)}"
         
         return None
 
-    def draw(self):
-        """Draw the checkpoint, score, progress bar, and depth for debugging."""
-        if not self.race_active:
-            return
-
-        # === Calculate Checkpoint Position and Size Based on Depth ===
+    def checkpoint_screen(self):
+        """Returns the checkpoint's on-screen position and radius."""
         parallax_factor = 1.0 / max(self.checkpoint_depth, MIN_DEPTH)
         on_screen_x = self.checkpoint_pos.x * parallax_factor
         on_screen_y = self.checkpoint_pos.y * parallax_factor
         checkpoint_radius = max(10, CAPTURE_RADIUS * parallax_factor)
+        return on_screen_x, on_screen_y, checkpoint_radius
+
+    def emit_overlay(self, batch):
+        """
+        Queues the checkpoint ring and capture progress arc into the overlay batch.
 
-        # === Draw the Checkpoint Circle ===
-        pygame.draw.circle(self.screen, (255, 255, 0), (int(on_screen_x), int(on_screen_y)), int(checkpoint_radius), 2)
+        Args:
+            batch (SpriteBatch): Overlay batch, drawn after the world layers.
+        """
+        if not self.race_active:
+            return
+        on_screen_x, on_screen_y, checkpoint_radius = self.checkpoint_screen()
+        add_ring(batch, checkpoint_radius, (255, 255, 0), (on_screen_x, on_screen_y))
 
-        # === Draw Capture Progress Arc (if capturing) ===
+        # Capture progress arc (if capturing)
         if self.current_controller is not None:
             progress_ratio = min(self.capture_timer / CAPTURE_TIME_REQUIRED, 1.0)
-            start_angle = -math.pi / 2
-            end_angle = start_angle + 2 * math.pi * progress_ratio
-            arc_rect = [
-                on_screen_x - checkpoint_radius,
-                on_screen_y - checkpoint_radius,
-                checkpoint_radius * 2,
-                checkpoint_radius * 2
-            ]
-            pygame.draw.arc(self.screen, (0, 255, 0), arc_rect, start_angle, end_angle, 4)
+            add_arc(batch, checkpoint_radius, progress_ratio, (0, 255, 0), (on_screen_x, on_screen_y))
+
+    def draw(self, rects=None):
+        """
+        Draw the score and the checkpoint depth for debugging; the checkpoint ring
+        and progress arc are drawn by emit_overlay.
+
+        Args:
+            rects (list, optional): Receives the rect of everything drawn, for dirty-rect presentation.
+        """
+        if not self.race_active:
+            return
+        drawn = []
+
+        # === Calculate Checkpoint Position and Size Based on Depth ===
+        on_screen_x, on_screen_y, checkpoint_radius = self.checkpoint_screen()
 
         # === Draw Checkpoint Depth for Debugging ===
-        font = pygame.font.SysFont(None, 24)  # Smaller font for debug info
-        depth_text = f"z = {self.checkpoint_depth:.2f}"  # Show 2 decimal places of depth
-        depth_text_surface = font.render(depth_text, True, (255, 255, 255))  # White text
-        text_x = on_screen_x - depth_text_surface.get_width() // 2  # Center it
+        # Depth changes every frame, so the digits come from the glyph atlas
+        depth_value = f"{self.checkpoint_depth:.2f}"  # Show 2 decimal places of depth
+        depth_width = label_width("z = ", depth_value, 24, (255, 255, 255))
+        text_x = on_screen_x - depth_width // 2  # Center it
         text_y = on_screen_y + checkpoint_radius + 5  # Position it below the checkpoint
-        self.screen.blit(depth_text_surface, (text_x, text_y))  # Render the text on the screen
+        depth_width = blit_label(self.screen, "z = ", depth_value, 24, (255, 255, 255), (text_x, text_y))
+        drawn.append(pygame.Rect(text_x, text_y, depth_width, 24))
 
         # === Draw the Scoreboard ===
-        font = pygame.font.SysFont(None, 36)
         y_offset = 10
         for racer_id, score in self.scores.items():
-            text_str = f"{racer_id}: {score}"
-            text_surf = font.render(text_str, True, (255, 255, 255))
-            self.screen.blit(text_surf, (10, y_offset))
+            text_surf = render_text(f"{racer_id}: {score}", 36, (255, 255, 255))  # Memoized until the score changes
+            drawn.append(self.screen.blit(text_surf, (10, y_offset)))
             y_offset += 30
+
+        if rects is not None:
+            rects.extend(drawn)
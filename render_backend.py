@@ -0,0 +1,300 @@
+# render_backend.py
+
+import math
+import weakref
+import pygame
+from constants import *
+
+RENDER_BACKENDS = ("surface", "texture", "texture-software")
+
+# SDL_BlendMode values used by pygame._sdl2.video.Texture.blend_mode
+SDL_BLENDMODE_BLEND = 1
+SDL_BLENDMODE_ADD = 2
+
+SCALED_SPRITE_LIMIT = 8192  # Downscaled sprites kept by a ScaledCanvas before it starts over
+
+class SurfaceBackend:
+    """
+    The default backend: everything is blitted in software onto the display
+    surface returned by pygame.display.set_mode.
+    """
+    name = "surface"
+    supports_dirty_rects = True
+
+    def __init__(self, size, fullscreen=False):
+        self.screen = pygame.display.set_mode(size, pygame.FULLSCREEN if fullscreen else 0)
+        pygame.display.set_caption("Pulse Vector")
+
+    def touch(self, rect):
+        """Primitive draws land directly in the display surface; nothing to track."""
+
+    def present(self, dirty):
+        """Presents the frame through the dirty-rect tracker (flip or partial update)."""
+        dirty.present()
+
+    def read_frame(self):
+        """Returns the current frame as a Surface."""
+        return self.screen
+
+class TextureCanvas(pygame.Surface):
+    """
+    A screen-sized SRCALPHA Surface that stands in for the display surface when
+    drawing through an SDL2 Renderer.
+
+    Sprite blits never touch the canvas pixels: each source Surface is uploaded
+    once as a Texture (cached per Surface object, released with it) and drawn
+    with a texture copy. Cached sprites are immutable, so a texture is uploaded
+    once and reused every frame.
+
+    Primitive draws (pygame.draw, surfarray writes) still go into the canvas
+    pixels; callers report the touched rect with `touch`. Before the next
+    texture copy, and at present, the touched region is streamed into an
+    overlay texture, drawn, and cleared, so draw order is kept exactly.
+
+    The composed frame lives in the renderer; use `read_frame` to get it back.
+    """
+
+    def __init__(self, renderer, size):
+        """
+        Args:
+            renderer (pygame._sdl2.video.Renderer): Renderer to draw with.
+            size (tuple): Canvas size, normally the window size.
+        """
+        from pygame._sdl2.video import Texture
+
+        super().__init__(size, pygame.SRCALPHA)
+        self.renderer = renderer
+        self.textures = weakref.WeakKeyDictionary()
+        self.overlay = Texture(renderer, size, streaming=True)
+        self.overlay.blend_mode = SDL_BLENDMODE_BLEND
+        self.pending = None  # Union of primitive draws not yet pushed to the renderer
+        self.uploads = 0     # Textures created from sprites
+
+    def texture(self, surface):
+        """Returns the texture for `surface`, uploading it on first use."""
+        texture = self.textures.get(surface)
+        if texture is None:
+            from pygame._sdl2.video import Texture
+
+            texture = Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = SDL_BLENDMODE_BLEND
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def touch(self, rect):
+        """Records that primitives were drawn into `rect` of the canvas."""
+        rect = pygame.Rect(rect)
+        self.pending = rect if self.pending is None else self.pending.union(rect)
+
+    def flush(self):
+        """Pushes pending primitive pixels to the renderer and clears them from the canvas."""
+        if self.pending is None:
+            return
+        region = self.pending.clip(self.get_rect())
+        self.pending = None
+        if region.w and region.h:
+            self.overlay.update(self.subsurface(region), region)
+            self.overlay.draw(srcrect=region, dstrect=region)
+            super().fill((0, 0, 0, 0), region)
+
+    def _copy(self, source, dest, area=None, special_flags=0):
+        texture = self.texture(source)
+        if area is None:
+            width, height = source.get_size()
+        else:
+            area = pygame.Rect(area)
+            width, height = area.size
+        rect = pygame.Rect(int(dest[0]), int(dest[1]), width, height)
+        if special_flags in (pygame.BLEND_ADD, pygame.BLEND_RGB_ADD, pygame.BLEND_RGBA_ADD):
+            texture.blend_mode = SDL_BLENDMODE_ADD
+            texture.draw(srcrect=area, dstrect=rect)
+            texture.blend_mode = SDL_BLENDMODE_BLEND
+        else:
+            texture.draw(srcrect=area, dstrect=rect)
+        return rect.clip(self.get_rect())
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """Surface.blit, drawn as a texture copy."""
+        self.flush()
+        return self._copy(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Surface.blits, drawn as texture copies in order."""
+        self.flush()
+        rects = [self._copy(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def blit_scaled(self, source, rect, special_flags=0):
+        """
+        Draws all of `source` stretched to `rect`; the renderer does the scaling.
+
+        Returns:
+            pygame.Rect: The drawn rect, clipped to the canvas.
+        """
+        self.flush()
+        rect = pygame.Rect(rect)
+        texture = self.texture(source)
+        if special_flags in (pygame.BLEND_ADD, pygame.BLEND_RGB_ADD, pygame.BLEND_RGBA_ADD):
+            texture.blend_mode = SDL_BLENDMODE_ADD
+            texture.draw(dstrect=rect)
+            texture.blend_mode = SDL_BLENDMODE_BLEND
+        else:
+            texture.draw(dstrect=rect)
+        return rect.clip(self.get_rect())
+
+    def blit_rotated(self, source, center, angle):
+        """
+        Draws `source` rotated counterclockwise by `angle` degrees (the
+        pygame.transform.rotate convention) and centered on `center`.
+
+        Returns:
+            pygame.Rect: Bounding rect of the rotated sprite.
+        """
+        self.flush()
+        width, height = source.get_size()
+        rect = pygame.Rect(0, 0, width, height)
+        rect.center = (int(center[0]), int(center[1]))
+        self.texture(source).draw(dstrect=rect, angle=-angle)  # SDL rotates clockwise
+        radians = math.radians(angle)
+        cos, sin = abs(math.cos(radians)), abs(math.sin(radians))
+        bounds = pygame.Rect(0, 0, int(width * cos + height * sin) + 1, int(width * sin + height * cos) + 1)
+        bounds.center = rect.center
+        return bounds.clip(self.get_rect())
+
+    def fill(self, color, rect=None, special_flags=0):
+        """Clears the frame (no rect) or fills a rect of it on the renderer."""
+        renderer = self.renderer
+        renderer.draw_color = pygame.Color(color)
+        if rect is None:
+            renderer.clear()
+            super().fill((0, 0, 0, 0))
+            self.pending = None
+            return self.get_rect()
+        self.flush()
+        rect = pygame.Rect(rect).clip(self.get_rect())
+        renderer.fill_rect(rect)
+        return rect
+
+    def present(self):
+        """Pushes any remaining primitives and shows the frame."""
+        self.flush()
+        self.renderer.present()
+
+class ScaledCanvas(pygame.Surface):
+    """
+    Internal render target at a fraction of the screen resolution.
+
+    World drawing keeps using screen (world) coordinates: blit and blits scale
+    their destinations by `render_scale` and draw a copy of the source that was
+    downscaled once (cached per source surface). The canvas
+    is then upscaled onto the display with `present_to`, so fill and blend
+    costs drop with the square of the scale while the simulation is untouched.
+    """
+
+    def __init__(self, size, render_scale):
+        """
+        Args:
+            size (tuple): Full (world) frame size.
+            render_scale (float): Fraction of `size` to render at, e.g. 0.5.
+        """
+        super().__init__((max(1, int(size[0] * render_scale)), max(1, int(size[1] * render_scale))))
+        self.render_scale = render_scale
+        self.sprites = {}  # id(source) -> (source, scaled); the source ref keeps the id valid
+
+    def sprite(self, source):
+        """Returns `source` downscaled by render_scale, building it on first use."""
+        entry = self.sprites.get(id(source))
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        scale = self.render_scale
+        width, height = source.get_size()
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        colorkey = source.get_colorkey()
+        if colorkey is not None or source.get_bitsize() < 24:
+            # Filtering would blend the key color into the edges; keep hard pixels
+            scaled = pygame.transform.scale(source, size)
+            if colorkey is not None:
+                scaled.set_colorkey(colorkey, pygame.RLEACCEL)
+        else:
+            scaled = pygame.transform.smoothscale(source, size)
+        if len(self.sprites) >= SCALED_SPRITE_LIMIT:
+            self.sprites.clear()  # Drops sprites of surfaces that are gone (replaced HUDs, old layer bakes)
+        self.sprites[id(source)] = (source, scaled)
+        return scaled
+
+    def _scaled(self, source, dest, area=None, special_flags=0):
+        scale = self.render_scale
+        dest = (int(dest[0] * scale), int(dest[1] * scale))
+        if area is not None:
+            area = pygame.Rect(area)
+            area = pygame.Rect(int(area.x * scale), int(area.y * scale),
+                               max(1, round(area.w * scale)), max(1, round(area.h * scale)))
+        return (self.sprite(source), dest, area, special_flags)
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """Surface.blit in world coordinates."""
+        return super().blit(*self._scaled(source, dest, area, special_flags))
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Surface.blits in world coordinates."""
+        scale = self.render_scale
+        sprites = self.sprites
+        scaled = []
+        for item in blit_sequence:
+            if len(item) != 2:
+                scaled.append(self._scaled(*item))
+                continue
+            source, dest = item
+            entry = sprites.get(id(source))
+            sprite = entry[1] if entry is not None and entry[0] is source else self.sprite(source)
+            scaled.append((sprite, (int(dest[0] * scale), int(dest[1] * scale))))
+        return super().blits(scaled, doreturn)
+
+    def present_to(self, target):
+        """Upscales the frame onto `target` (the display surface)."""
+        pygame.transform.scale(self, target.get_size(), target)
+
+class TextureBackend:
+    """
+    Draws through pygame._sdl2.video: a Window, a Renderer and a TextureCanvas
+    as the screen. `software=True` asks SDL for its software renderer, which
+    works on machines without a GPU (and with the dummy video driver).
+    """
+    supports_dirty_rects = False  # The renderer redraws every frame
+
+    def __init__(self, size, fullscreen=False, software=False):
+        from pygame._sdl2.video import Window, Renderer
+
+        self.name = "texture-software" if software else "texture"
+        self.window = Window("Pulse Vector", size=size, fullscreen=fullscreen)
+        self.renderer = Renderer(self.window, accelerated=0 if software else -1)
+        self.screen = TextureCanvas(self.renderer, size)
+
+    def touch(self, rect):
+        """Reports primitives drawn into `rect` of the screen canvas."""
+        self.screen.touch(rect)
+
+    def present(self, dirty):
+        """Presents the renderer; dirty rects don't apply."""
+        self.screen.present()
+
+    def read_frame(self):
+        """Returns the current frame as a Surface (reads back from the renderer)."""
+        self.screen.flush()
+        return self.renderer.to_surface()
+
+def create_backend(name, size, fullscreen=False):
+    """
+    Creates the render backend selected at startup.
+
+    Args:
+        name (str): One of RENDER_BACKENDS.
+        size (tuple): Window size.
+        fullscreen (bool): Open fullscreen.
+    """
+    if name == "surface":
+        return SurfaceBackend(size, fullscreen)
+    if name in ("texture", "texture-software"):
+        return TextureBackend(size, fullscreen, software=name == "texture-software")
+    raise ValueError(f"Unknown render backend {name!r}; expected one of {', '.join(RENDER_BACKENDS)}")
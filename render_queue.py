@@ -0,0 +1,72 @@
+# render_queue.py
+
+import numpy as np
+
+class RenderQueue:
+    """
+    Depth-ordered draw list for one frame, stored as parallel preallocated arrays.
+
+    `push` writes a depth into a float array and the drawable into a list at the
+    same index; nothing is allocated per object. `emit` argsorts the depths once
+    and hands every drawable to a SpriteBatch exactly once, farthest first
+    (painter's algorithm). Both arrays grow by doubling and are reused across
+    frames, so a steady-state frame only allocates the sort permutation.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity (int): Initial number of slots.
+        """
+        self.depths = np.empty(capacity, dtype=np.float64)
+        self.items = [None] * capacity
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Empties the queue, keeping its storage."""
+        self.count = 0
+
+    def push(self, depth, item):
+        """
+        Queues one drawable.
+
+        Args:
+            depth (float): Sort key; larger is farther from the viewer.
+            item: Object with an `emit(batch)` method.
+        """
+        index = self.count
+        if index == len(self.items):
+            self._grow()
+        self.depths[index] = depth
+        self.items[index] = item
+        self.count = index + 1
+
+    def _grow(self):
+        capacity = len(self.items) * 2
+        depths = np.empty(capacity, dtype=np.float64)
+        depths[:self.count] = self.depths[:self.count]
+        self.depths = depths
+        self.items.extend([None] * (capacity - len(self.items)))
+
+    def order(self):
+        """Returns the queued item indices sorted back to front (farthest first)."""
+        order = np.argsort(self.depths[:self.count], kind='stable')
+        return order[::-1].tolist()
+
+    def emit(self, batch, culler=None):
+        """
+        Emits every queued drawable into `batch` back to front and empties the queue.
+
+        Args:
+            batch (SpriteBatch): Batch to fill; the caller flushes it.
+            culler (Culler, optional): Skips drawables whose screen bounds are off-screen.
+        """
+        items = self.items
+        for index in self.order():
+            item = items[index]
+            if culler is None or culler.visible(item):
+                item.emit(batch)
+        self.count = 0
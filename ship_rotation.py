@@ -0,0 +1,106 @@
+# ship_rotation.py
+
+import pygame
+from constants import PIXEL_SIZE, pixel_colors
+from sprite_cache import SpriteCache, finalize_sprite
+from spaceship import matrix_key
+
+ROTATION_STEP = 5  # Degrees between cached rotations of a ship sprite
+ROTATED_SHIP_CACHE = SpriteCache(4096, name="rotated_ship")
+
+def render_ship_surface(matrix, scale=1.0):
+    """
+    Renders the spaceship pixel matrix, unrotated, into a new SRCALPHA surface.
+
+    Args:
+        matrix: 2D list representing the spaceship shape.
+        scale: Scaling factor for the spaceship size.
+    """
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows > 0 else 0
+    ship_width = cols * PIXEL_SIZE * scale
+    ship_height = rows * PIXEL_SIZE * scale
+    ship_surface = pygame.Surface((ship_width, ship_height), pygame.SRCALPHA)
+
+    # Draw the ship on the ship_surface
+    for row_index, row in enumerate(matrix):
+        for col_index, pixel in enumerate(row):
+            if pixel in pixel_colors:
+                color_pixel = pixel_colors[pixel]
+                pygame.draw.rect(
+                    ship_surface,
+                    color_pixel,
+                    (
+                        col_index * PIXEL_SIZE * scale,
+                        row_index * PIXEL_SIZE * scale,
+                        PIXEL_SIZE * scale,
+                        PIXEL_SIZE * scale,
+                    ),
+                )
+    return ship_surface
+
+def rotated_ship_sprite(matrix, scale=1.0, rotation=0):
+    """
+    Returns a cached rotated ship sprite and its half extents.
+
+    The rotation is snapped to ROTATION_STEP degrees, so a ship is rendered and
+    rotated at most 360 / ROTATION_STEP times per (shape, scale).
+
+    Args:
+        matrix: 2D list representing the spaceship shape.
+        scale: Scaling factor for the spaceship size.
+        rotation: Rotation angle in degrees.
+
+    Returns:
+        tuple: (surface, (half_width, half_height)).
+    """
+    steps = 360 // ROTATION_STEP
+    angle_index = int(round(rotation / ROTATION_STEP)) % steps
+    scale = round(scale, 2)
+
+    def build():
+        # **Rotate the ship_surface by adding 180 degrees to the rotation**
+        rotated_ship = pygame.transform.rotate(render_ship_surface(matrix, scale), -angle_index * ROTATION_STEP + 180)
+        rotated_ship = finalize_sprite(rotated_ship)
+        return rotated_ship, (rotated_ship.get_width() // 2, rotated_ship.get_height() // 2)
+
+    return ROTATED_SHIP_CACHE.get((matrix_key(matrix), scale, angle_index), build)
+
+def warm_rotation_cache(matrices, scales=(1.0,)):
+    """
+    Pre-renders every ROTATION_STEP rotation of the given shapes, e.g. at startup,
+    so the first frames of smooth rotation don't pay for the bake.
+    """
+    for matrix in matrices:
+        for scale in scales:
+            for angle in range(0, 360, ROTATION_STEP):
+                rotated_ship_sprite(matrix, scale, angle)
+
+def draw_spaceship(surface, matrix, position, scale=1.0, color=(255, 255, 255), rotation=0):
+    """
+    Draws a spaceship with one pixel colored cyan, rotated based on the direction.
+
+    The rotated sprite comes from ROTATED_SHIP_CACHE, so drawing is one lookup
+    plus one blit. On a TextureCanvas the renderer does the rotation instead.
+
+    Args:
+        surface: Pygame surface to draw on.
+        matrix: 2D list representing the spaceship shape.
+        position: Tuple (x, y) for the spaceship position.
+        scale: Scaling factor for the spaceship size.
+        color: Base color for the spaceship.
+        rotation: Rotation angle in degrees.
+    """
+    # Texture backends rotate on the renderer: the unrotated sprite is uploaded once
+    blit_rotated = getattr(surface, "blit_rotated", None)
+    if blit_rotated is not None:
+        angle_index = int(round(rotation / ROTATION_STEP)) % (360 // ROTATION_STEP)
+        scale = round(scale, 2)
+        ship = ROTATED_SHIP_CACHE.get((matrix_key(matrix), scale, None),
+                                      lambda: finalize_sprite(render_ship_surface(matrix, scale)))
+        return blit_rotated(ship, position, -angle_index * ROTATION_STEP + 180)
+
+    rotated_ship, (half_width, half_height) = rotated_ship_sprite(matrix, scale, rotation)
+
+    # Blit the rotated ship centered on the desired position
+    return surface.blit(rotated_ship, (int(position[0]) - half_width, int(position[1]) - half_height))
@@ -0,0 +1,48 @@
+# sim_clock.py
+
+import pygame
+
+class SimClock:
+    """
+    Simulation time, advanced by the game once per step.
+
+    Time-based logic (fire cadence, bullet lifespans, enemy wander, star
+    flicker) reads `ticks` instead of pygame.time.get_ticks(), so a run
+    depends only on the steps taken: stepping a headless game at any speed
+    gives the same result as playing it in real time, and the value is read
+    from an attribute rather than queried from SDL by every object.
+    """
+
+    def __init__(self, start=0):
+        """
+        Args:
+            start (float): Initial time in milliseconds.
+        """
+        self.ticks = start  # Milliseconds of simulated time, like pygame.time.get_ticks()
+
+    def advance(self, delta_time):
+        """
+        Moves the clock forward by one step.
+
+        Args:
+            delta_time (float): Step length in seconds.
+        """
+        self.ticks += delta_time * 1000.0
+
+    @property
+    def seconds(self):
+        """Simulated time in seconds."""
+        return self.ticks / 1000.0
+
+class WallClock:
+    """Real time with the SimClock interface; the default for objects made outside a Game."""
+
+    @property
+    def ticks(self):
+        return pygame.time.get_ticks()
+
+    @property
+    def seconds(self):
+        return pygame.time.get_ticks() / 1000.0
+
+WALL_CLOCK = WallClock()
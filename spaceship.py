@@ -1,4 +1,5 @@
 import pygame
+from sprite_cache import SpriteCache, finalize_sprite
 
 PIXEL_COLORS = {
     1: (180, 180, 190), 
@@ -211,11 +212,29 @@ RAW_SPACESHIP_SHAPES = {
 }
 
 PIXEL_SIZE = 5
+SHADE_COLOR_STEP = 8        # Override colors are snapped to this grid before caching
+SHIP_SPRITE_CACHE_SIZE = 512
+
+SHIP_SPRITE_CACHE = SpriteCache(SHIP_SPRITE_CACHE_SIZE, name="ship")
+_MATRIX_KEYS = {}  # id(matrix) -> (matrix, hashable key); holding the matrix keeps the id stable
 
 # spaceship.py
-def draw_spaceship(surface, matrix, position, scale_factor=1, color_override=None):
-    x, y = position
+def render_spaceship(matrix, scale_factor=1, color_override=None):
+    """
+    Renders a ship matrix into its own SRCALPHA surface so it can be blitted or batched.
+
+    Args:
+        matrix: 2D list of pixel codes (keys of PIXEL_COLORS; 0 is transparent).
+        scale_factor (float): Scale applied to PIXEL_SIZE.
+        color_override (tuple, optional): Single color used for every filled pixel.
+
+    Returns:
+        pygame.Surface: The rendered ship, top-left aligned with the matrix origin.
+    """
     pixel_size = int(PIXEL_SIZE * scale_factor)  # Scale the pixel size
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows > 0 else 0
+    ship_surface = pygame.Surface((cols * pixel_size, rows * pixel_size), pygame.SRCALPHA)
     for row_index, row in enumerate(matrix):
         for col_index, pixel in enumerate(row):
             if pixel in PIXEL_COLORS:
@@ -223,16 +242,56 @@ def draw_spaceship(surface, matrix, position, scale_factor=1, color_override=Non
                 color = color_override if color_override else PIXEL_COLORS.get(pixel, (255, 255, 255))
                 if not isinstance(color, tuple) or len(color) < 3 or not all(0 <= c <= 255 for c in color):
                     color = (255, 255, 255)  # Default to white if color is invalid
-                pygame.draw.rect(
-                    surface,
+                ship_surface.fill(
                     color,
                     (
-                        x + col_index * pixel_size,
-                        y + row_index * pixel_size,
+                        col_index * pixel_size,
+                        row_index * pixel_size,
                         pixel_size,
                         pixel_size,
                     ),
                 )
+    return ship_surface
+
+def matrix_key(matrix):
+    """Returns a hashable key for a ship matrix, memoized per matrix object."""
+    entry = _MATRIX_KEYS.get(id(matrix))
+    if entry is None or entry[0] is not matrix:
+        entry = (matrix, tuple(tuple(row) for row in matrix))
+        _MATRIX_KEYS[id(matrix)] = entry
+    return entry[1]
+
+def quantize_color(color):
+    """Snaps an RGB color to the SHADE_COLOR_STEP grid used by the ship sprite cache."""
+    if not color:
+        return None
+    return tuple(min(255, int(c) // SHADE_COLOR_STEP * SHADE_COLOR_STEP) for c in color[:3])
+
+def ship_sprite(matrix, scale_factor=1, color_override=None):
+    """
+    Returns the pre-baked sprite for a ship matrix from SHIP_SPRITE_CACHE.
+
+    Sprites are keyed by (matrix, pixel size, quantized override color); the
+    pixel size is already an integer bucket of the scale factor.
+
+    Args:
+        matrix: 2D list of pixel codes.
+        scale_factor (float): Scale applied to PIXEL_SIZE.
+        color_override (tuple, optional): Single color used for every filled pixel.
+
+    Returns:
+        pygame.Surface: Cached ship sprite.
+    """
+    pixel_size = int(PIXEL_SIZE * scale_factor)
+    color = quantize_color(color_override)
+    return SHIP_SPRITE_CACHE.get(
+        (matrix_key(matrix), pixel_size, color),
+        lambda: finalize_sprite(render_spaceship(matrix, pixel_size / PIXEL_SIZE, color))
+    )
+
+def draw_spaceship(surface, matrix, position, scale_factor=1, color_override=None):
+    x, y = position
+    return surface.blit(ship_sprite(matrix, scale_factor, color_override), (int(x), int(y)))
 
 SPACESHIP_SHAPES = {
     direction: [
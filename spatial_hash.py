@@ -0,0 +1,189 @@
+# spatial_hash.py
+
+import math
+from constants import *
+
+SPATIAL_CELL_SIZE = 160  # Target cell edge in pixels; snapped so whole cells tile the world
+SPATIAL_DEPTH_CELL = 0.5  # Depth bucket of the enemy hash (race captures query by depth)
+
+class SpatialHash:
+    """
+    Uniform grid over the toroidal WIDTH x HEIGHT world, optionally also
+    bucketed by depth.
+
+    Objects are filed by the cell of their (wrapped) position and looked up
+    by visiting only the cells a query circle overlaps, wrapping around the
+    edges, with distances measured the way the AI measures them by hand:
+    per axis, the shorter of the direct and the wrapped-around gap. The grid
+    is rebuilt from scratch rather than tracking cell changes; `invalidate`
+    defers that to the first query after the objects moved, so a frame pays
+    for at most one rebuild, and none when nothing searches.
+
+    Results come back in insertion order, so callers that used to scan a
+    list and take the first match still see matches in list order.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE, size=(WIDTH, HEIGHT), depth_cell=None):
+        """
+        Args:
+            cell_size (float): Approximate cell edge in pixels.
+            size (tuple): World (width, height) the positions wrap around.
+            depth_cell (float, optional): Depth range per bucket; None files every
+                depth in one bucket.
+        """
+        self.width, self.height = size
+        self.columns = max(1, round(self.width / cell_size))
+        self.rows = max(1, round(self.height / cell_size))
+        self.cell_width = self.width / self.columns
+        self.cell_height = self.height / self.rows
+        self.reach = math.hypot(self.width, self.height) / 2  # Farthest any point can be
+        self.depth_cell = depth_cell
+        self.cells = {}    # (column, row, depth bucket) -> [(order, object)]
+        self.count = 0
+        self.pending = None  # Objects to refile before the next query (see invalidate)
+
+    @classmethod
+    def build(cls, objects, **kwargs):
+        """Returns a new hash holding `objects`."""
+        index = cls(**kwargs)
+        index.rebuild(objects)
+        return index
+
+    def __len__(self):
+        self._refresh()
+        return self.count
+
+    def _refresh(self):
+        if self.pending is not None:
+            self.rebuild(self.pending)
+
+    def _bucket(self, depth):
+        return int(depth // self.depth_cell) if self.depth_cell else 0
+
+    def invalidate(self, objects):
+        """
+        Marks the index out of date after `objects` moved; the next query rebuilds it.
+
+        Args:
+            objects (list): Objects to index from now on.
+        """
+        self.pending = objects
+
+    def rebuild(self, objects):
+        """
+        Refiles every object at its current position.
+
+        Args:
+            objects (iterable): Objects with `position` (and `depth` when bucketed by depth).
+        """
+        self.pending = None
+        cells = self.cells
+        cells.clear()
+        cell_width, cell_height = self.cell_width, self.cell_height
+        columns, rows = self.columns, self.rows
+        depth_cell = self.depth_cell
+        order = -1
+        for order, obj in enumerate(objects):
+            position = obj.position
+            key = (int(position.x // cell_width) % columns, int(position.y // cell_height) % rows,
+                   int(obj.depth // depth_cell) if depth_cell else 0)
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [(order, obj)]
+            else:
+                cell.append((order, obj))
+        self.count = order + 1
+
+    def _spans(self, low, high, cell, count):
+        # Cell indices covered by [low, high] on one wrapping axis, each once
+        first, last = int(low // cell), int(high // cell)
+        if last - first + 1 >= count:
+            return range(count)
+        return [index % count for index in range(first, last + 1)]
+
+    def query_radius(self, position, radius, depth=None, depth_radius=None):
+        """
+        Finds the objects within `radius` of `position`, wrapping around the world edges.
+
+        Args:
+            position (tuple): Query center (any coordinates; wrapped onto the world).
+            radius (float): Search radius in pixels.
+            depth (float, optional): With `depth_radius`, keep only objects whose depth
+                is within `depth_radius` of `depth`.
+            depth_radius (float, optional): Depth tolerance.
+
+        Returns:
+            list: (distance, object) pairs in insertion order.
+        """
+        self._refresh()
+        x, y = position[0], position[1]
+        columns = self._spans(x - radius, x + radius, self.cell_width, self.columns)
+        rows = self._spans(y - radius, y + radius, self.cell_height, self.rows)
+        filter_depth = depth is not None and depth_radius is not None
+        if filter_depth and self.depth_cell:
+            buckets = range(self._bucket(depth - depth_radius), self._bucket(depth + depth_radius) + 1)
+        else:
+            buckets = (0,) if not self.depth_cell else None
+
+        width, height = self.width, self.height
+        half_width, half_height = width / 2, height / 2
+        hypot = math.hypot
+        found = []
+        for key, cell in self._cells(columns, rows, buckets):
+            for order, obj in cell:
+                obj_position = obj.position
+                dx = abs(obj_position.x - x) % width
+                if dx > half_width:
+                    dx = width - dx
+                dy = abs(obj_position.y - y) % height
+                if dy > half_height:
+                    dy = height - dy
+                distance = hypot(dx, dy)
+                if distance > radius:
+                    continue
+                if filter_depth and abs(obj.depth - depth) > depth_radius:
+                    continue
+                found.append((order, distance, obj))
+        found.sort(key=lambda entry: entry[0])
+        return [(distance, obj) for _, distance, obj in found]
+
+    def _cells(self, columns, rows, buckets):
+        cells = self.cells
+        if buckets is None:
+            # Every depth bucket: walk the occupied cells instead of guessing bucket ranges
+            wanted = {(column, row) for column in columns for row in rows}
+            for key, cell in cells.items():
+                if key[:2] in wanted:
+                    yield key, cell
+            return
+        for column in columns:
+            for row in rows:
+                for bucket in buckets:
+                    cell = cells.get((column, row, bucket))
+                    if cell is not None:
+                        yield (column, row, bucket), cell
+
+    def nearest(self, position, k=1, exclude=()):
+        """
+        Finds the `k` objects closest to `position` by wrap-around distance.
+
+        The search radius starts at one cell and doubles until `k` objects lie
+        within it (or it spans the whole world).
+
+        Args:
+            position (tuple): Query center.
+            k (int): Number of objects wanted.
+            exclude (collection): Objects to skip.
+
+        Returns:
+            list: Up to `k` (distance, object) pairs, nearest first.
+        """
+        reach = self.reach
+        radius = max(self.cell_width, self.cell_height)
+        while True:
+            found = [(distance, obj) for distance, obj in self.query_radius(position, radius)
+                     if obj not in exclude]
+            if len(found) >= k or radius >= reach:
+                found.sort(key=lambda entry: entry[0])
+                return found[:k]
+            radius *= 2
@@ -0,0 +1,89 @@
+# sprite_batch.py
+
+class SpriteBatch:
+    """
+    Collects (surface, dest) blit requests for one depth layer of a frame and
+    submits them to SDL in a single `Surface.blits` call.
+
+    Drawables append to the batch through their `emit()` method instead of
+    blitting directly, which removes the per-object Python -> SDL call overhead.
+    Submission order is preserved, so painter's-algorithm layering still holds.
+    When `additive_glow` is set, glowing drawables queue their glow as opaque
+    light sprites with BLEND_RGB_ADD instead of as alpha sprites; drawables
+    with trails stamp their sprite into `trails`.
+    The rare shape too large to pre-render is queued as a draw call with
+    `add_draw` and runs between the blits queued before and after it.
+    """
+
+    def __init__(self):
+        self.sprites = []
+        self.draws = []  # (index into sprites, draw) pairs run before that sprite is blitted
+        self.additive_glow = False  # Glow goes in as additive light sprites (lighting.py)
+        self.trails = None  # TrailBuffer that drawables with trails stamp into
+
+    def add(self, surface, dest, area=None, special_flags=0):
+        """
+        Queues one blit.
+
+        Args:
+            surface (pygame.Surface): Source sprite.
+            dest (tuple): Top-left destination (x, y) on the target.
+            area (pygame.Rect, optional): Source sub-rectangle.
+            special_flags (int): pygame blend flags (e.g. BLEND_RGB_ADD).
+        """
+        if special_flags:
+            self.sprites.append((surface, dest, area, special_flags))
+        elif area is not None:
+            self.sprites.append((surface, dest, area))
+        else:
+            self.sprites.append((surface, dest))
+
+    def add_draw(self, draw):
+        """
+        Queues a direct draw call, run in submission order with the blits.
+
+        Args:
+            draw (callable): Called as draw(target); returns the touched pygame.Rect or None.
+        """
+        self.draws.append((len(self.sprites), draw))
+
+    def __len__(self):
+        return len(self.sprites) + len(self.draws)
+
+    def clear(self):
+        """Discards every queued blit and draw call without drawing."""
+        self.sprites.clear()
+        self.draws.clear()
+
+    def flush(self, target, rects=None):
+        """
+        Blits every queued sprite onto `target` in submission order and empties the batch.
+
+        Args:
+            target (pygame.Surface): Surface to draw onto.
+            rects (list, optional): When given, the rect of every blit is appended to it
+                (used for dirty-rect presentation).
+        """
+        if self.draws:
+            start = 0
+            for index, draw in self.draws:
+                self._blits(target, self.sprites[start:index], rects)
+                start = index
+                rect = draw(target)
+                if rect is not None and rects is not None:
+                    rects.append(rect)
+            self._blits(target, self.sprites[start:], rects)
+            self.sprites.clear()
+            self.draws.clear()
+        elif self.sprites:
+            self._blits(target, self.sprites, rects)
+            self.sprites.clear()
+
+    @staticmethod
+    def _blits(target, sprites, rects):
+        if not sprites:
+            return
+        if rects is None:
+            target.blits(sprites, doreturn=False)
+        else:
+            rects.extend(target.blits(sprites))
@@ -0,0 +1,113 @@
+# sprite_cache.py
+
+from collections import OrderedDict
+import pygame
+
+class SpriteCache:
+    """
+    A bounded LRU cache of pre-rendered surfaces.
+
+    Surfaces are built lazily by a caller-supplied builder the first time a key is
+    requested and are evicted least-recently-used once `maxsize` is exceeded, or
+    once their pixels exceed `max_bytes` when that is set (for caches whose
+    sprites vary widely in size). Hit/miss/eviction counters are kept so the
+    cache can be sized from real play.
+    """
+
+    def __init__(self, maxsize=1024, name="sprites", max_bytes=None):
+        """
+        Args:
+            maxsize (int): Maximum number of surfaces kept before evicting.
+            name (str): Label used when reporting stats.
+            max_bytes (int, optional): Maximum pixel bytes kept before evicting;
+                the newest surface is always kept.
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, builder):
+        """
+        Returns the cached value for `key`, building it with `builder()` on a miss.
+
+        Args:
+            key (hashable): Cache key.
+            builder (callable): Zero-argument function producing the value.
+
+        Returns:
+            The cached value (usually a pygame.Surface).
+        """
+        entries = self._entries
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = builder()
+        entries[key] = value
+        self.bytes += surface_bytes(value)
+        max_bytes = self.max_bytes
+        while len(entries) > 1 and (len(entries) > self.maxsize
+                                    or (max_bytes is not None and self.bytes > max_bytes)):
+            _, evicted = entries.popitem(last=False)
+            self.bytes -= surface_bytes(evicted)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drops every cached surface and resets the counters."""
+        self._entries.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, evictions, current size, pixel bytes and hit rate (0..1).
+        """
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'bytes': self.bytes,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+def surface_bytes(value):
+    """Returns the pixel bytes of a cached Surface, or of the Surfaces in a cached tuple or list."""
+    if isinstance(value, pygame.Surface):
+        width, height = value.get_size()
+        return width * height * value.get_bytesize()
+    if isinstance(value, (tuple, list)):
+        return sum(surface_bytes(item) for item in value)
+    return 0
+
+def finalize_sprite(surface):
+    """
+    Converts a freshly built SRCALPHA surface to the display's pixel format.
+
+    `convert_alpha()` needs a display mode; without one (headless runs, the SDL2
+    texture backend) the surface is returned unchanged.
+    """
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
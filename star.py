@@ -5,43 +5,124 @@ import pygame
 from pygame.math import Vector2
 import math
 from constants import *
+from sprite_cache import SpriteCache, finalize_sprite
+from sim_clock import WALL_CLOCK
+from lighting import to_light_sprite
+
+STAR_RADIUS_STEP = 0.5      # On-screen radius quantization for cached glow sprites (px)
+STAR_FLICKER_BUCKETS = 16   # Number of discrete flicker levels between FLICKER_MIN and FLICKER_MAX
+FLICKER_MIN = 0.4           # flicker_intensity (0.7) - 0.3
+FLICKER_MAX = 1.3           # flicker_intensity (1.0) + 0.3
+STAR_GLOW_CACHE_SIZE = 4096
+STAR_MAX_SIZE = 4.0         # Largest base_size; bounds the click radius (size / depth)
+
+# Level-of-detail tiers, assigned by starfield.StarFieldRenderer
+STAR_LOD_GLOW = 0   # Core plus three-ring glow
+STAR_LOD_CORE = 1   # Core circle only
+STAR_LOD_POINT = 2  # Single pixel, plotted in bulk outside the sprite batch
+
+GLOW_CACHE = SpriteCache(STAR_GLOW_CACHE_SIZE, name="star_glow")
+CORE_CACHE = SpriteCache(STAR_GLOW_CACHE_SIZE, name="star_core")
+GLOW_LIGHT_CACHE = SpriteCache(STAR_GLOW_CACHE_SIZE, name="star_glow_light")  # Glow sprites flattened for additive glow
+
+def quantize_star_radius(base_radius, flicker):
+    """
+    Snaps a star's on-screen radius and flicker to the cache grid.
+
+    Args:
+        base_radius (float): Unflickered radius from Star.get_click_radius().
+        flicker (float): Current flicker multiplier.
+
+    Returns:
+        tuple: (radius_key, flicker_key, radius) where radius is the quantized
+        on-screen radius the sprite is built for.
+    """
+    radius_key = max(1, int(base_radius / STAR_RADIUS_STEP + 0.5))
+    flicker = min(FLICKER_MAX, max(FLICKER_MIN, flicker))
+    flicker_key = int((flicker - FLICKER_MIN) / (FLICKER_MAX - FLICKER_MIN) * (STAR_FLICKER_BUCKETS - 1) + 0.5)
+    flicker_q = FLICKER_MIN + flicker_key * (FLICKER_MAX - FLICKER_MIN) / (STAR_FLICKER_BUCKETS - 1)
+    return radius_key, flicker_key, radius_key * STAR_RADIUS_STEP * flicker_q
+
+def build_glow_sprite(color, radius):
+    """
+    Renders the three-ring glow plus core used by Star.emit.
+
+    Args:
+        color (tuple): RGB star color.
+        radius (float): On-screen core radius.
+
+    Returns:
+        pygame.Surface: SRCALPHA sprite of size (4 * radius) with the star at its center.
+    """
+    glow_radius = radius * 2
+    glow_surface = pygame.Surface((int(glow_radius * 2), int(glow_radius * 2)), pygame.SRCALPHA)
+
+    # Inner glow
+    for i in range(3):
+        current_radius = glow_radius * (1 - i * 0.2)
+        alpha = int(100 * (1 - i * 0.3))//2
+        glow_color = (*color[:3], alpha)
+        pygame.draw.circle(glow_surface, glow_color,
+                         (int(glow_radius), int(glow_radius)), 
+                         max(1, int(current_radius)))
+
+    # Core star
+    pygame.draw.circle(glow_surface, color,
+                     (int(glow_radius), int(glow_radius)), 
+                     max(1, int(radius)))
+    return finalize_sprite(glow_surface)
+
+def build_core_sprite(color, radius):
+    """Renders only the solid core of a star, centered in a (2 * radius) sprite."""
+    size = max(2, int(radius * 2))
+    core_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(core_surface, color, (size // 2, size // 2), max(1, int(radius)))
+    return finalize_sprite(core_surface)
 
 class Star:
-    def __init__(self, x, y, depth):
+    def __init__(self, x, y, depth, clock=WALL_CLOCK, rng=random):
         """Initialize a star with enhanced visual properties.
         
         Args:
             x (float): Initial x-coordinate
             y (float): Initial y-coordinate
             depth (float): Initial depth in 3D space
+            clock (SimClock): Time source for the flicker
+            rng (random.Random): Random source; the `random` module by default
         """
+        self.clock = clock
         self.position = Vector2(x, y)
-        self.velocity = Vector2(random.uniform(-50, 50), random.uniform(-50, 50))
+        self.velocity = Vector2(rng.uniform(-50, 50), rng.uniform(-50, 50))
         self.depth = depth
-        self.base_size = random.uniform(1.5, 4.0)  # Base size for visual rendering
+        self.base_size = rng.uniform(1.5, STAR_MAX_SIZE)  # Base size for visual rendering
         self.size = self.base_size  # Compatibility attribute for click detection
-        self.flicker_intensity = random.uniform(0.7, 1.0)
-        self.flicker_speed = random.uniform(0.1, 0.5)
+        self.flicker_intensity = rng.uniform(0.7, 1.0)
+        self.flicker_speed = rng.uniform(0.1, 0.5)
         self.relative_velocity = Vector2(0, 0)
-        self.trail_positions = []
-        self.max_trail_length = 0
-        self.color = self._generate_star_color()
+        self.trail = STAR_TRAILS  # Stamp into the game's TrailBuffer
+        self.color = self._generate_star_color(rng)
         self.type = "star"
+        self.lod = STAR_LOD_GLOW
+        self.batched = True  # Drawn through the world batch (False when plotted or layered)
+        self.depth_listener = None  # Called with the star after a depth wrap (DepthIndex.move)
         
-    def _generate_star_color(self):
+    def _generate_star_color(self, rng):
         """Generate a slightly varied star color based on temperature simulation.
         
+        Args:
+            rng (random.Random): Random source
+        
         Returns:
             tuple: RGB color values
         """
-        temperature = random.uniform(0, 1)
+        temperature = rng.uniform(0, 1)
         if temperature < 0.3:  # Cooler stars (yellowish)
-            return (255, 255, random.randint(200, 255))
+            return (255, 255, rng.randint(200, 255))
         elif temperature < 0.7:  # Medium stars (white with slight variation)
-            base = random.randint(240, 255)
+            base = rng.randint(240, 255)
             return (base, base, base)
         else:  # Hotter stars (bluish)
-            return (random.randint(200, 255), random.randint(200, 255), 255)
+            return (rng.randint(200, 255), rng.randint(200, 255), 255)
 
     def update(self, player_velocity, depth_change, delta_time, is_target=False, global_depth_change=0):
         """
@@ -54,11 +135,6 @@ class Star:
             is_target (bool): Whether this star is currently targeted.
             global_depth_change (float): Global depth change affecting all stars.
         """
-        # Store previous position for trail effect
-        self.trail_positions.insert(0, self.position.copy())
-        if len(self.trail_positions) > self.max_trail_length:
-            self.trail_positions.pop()
-
         # Update depth and apply global depth change
         self.depth += depth_change + global_depth_change
 
@@ -112,8 +188,12 @@ class Star:
         # --- Depth wrapping ---
         if self.depth < MIN_DEPTH:
             self.depth = MAX_DEPTH - (MIN_DEPTH - self.depth)  # Wrap from min depth to max depth
+            if self.depth_listener is not None:
+                self.depth_listener(self)
         elif self.depth > MAX_DEPTH:
             self.depth = MIN_DEPTH + (self.depth - MAX_DEPTH)  # Wrap from max depth to min depth
+            if self.depth_listener is not None:
+                self.depth_listener(self)
 
     def get_click_radius(self):
         """Calculate the clickable radius of the star based on its depth.
@@ -135,47 +215,67 @@ class Star:
         click_radius = self.get_click_radius()
         return (self.position - click_position).length() <= click_radius * 1.5  # 1.5x radius for easier clicking
 
-    def draw(self, surface):
-        """Draw the star with enhanced visual effects.
-        
+    def screen_bounds(self):
+        """Conservative screen rect of the glow at peak flicker.
+
+        Returns:
+            pygame.Rect: Area the star's sprites can touch this frame
+        """
+        radius = self.get_click_radius() * FLICKER_MAX + STAR_RADIUS_STEP
+        reach = int(radius * 2) + 1  # Glow sprites extend two radii from the center
+        return pygame.Rect(int(self.position.x - reach), int(self.position.y - reach), reach * 2 + 1, reach * 2 + 1)
+
+    def emit(self, batch):
+        """Queue the star's glow sprite into a sprite batch.
+
+        Stars tagged STAR_LOD_CORE by the star field renderer skip the glow. When
+        the batch has `additive_glow` set, the same glow comes from GLOW_LIGHT_CACHE
+        as an opaque sprite and is added with BLEND_RGB_ADD instead of alpha blended.
+
+        The glow and core sprites come from the shared GLOW_CACHE / CORE_CACHE,
+        so a frame costs one blit per star instead of a surface allocation and
+        four circle draws. Stars with `trail` set also stamp that sprite into the
+        batch's trail buffer.
+
         Args:
-            surface (pygame.Surface): Target surface for rendering
+            batch (SpriteBatch): Batch collecting this frame's blits
         """
         base_radius = self.get_click_radius()
         
         # Apply flicker effect
-        flicker = self.flicker_intensity + math.sin(pygame.time.get_ticks() * 0.001 * self.flicker_speed) * 0.3
-        radius = base_radius * flicker
-        
-        # Draw motion trail
-        for i, pos in enumerate(self.trail_positions):
-            trail_alpha = int(255 * (1 - i / len(self.trail_positions)) * 0.3)
-            trail_color = (*self.color[:3], trail_alpha)
-            trail_surface = pygame.Surface((int(radius * 2), int(radius * 2)), pygame.SRCALPHA)
-            pygame.draw.circle(trail_surface, trail_color, 
-                             (int(radius), int(radius)), max(1, radius * 0.8))
-            surface.blit(trail_surface, 
-                        (int(pos.x - radius), int(pos.y - radius)))
-
-        # Draw main star with glow effect
+        flicker = self.flicker_intensity + math.sin(self.clock.ticks * 0.001 * self.flicker_speed) * 0.3
+        radius_key, flicker_key, radius = quantize_star_radius(base_radius, flicker)
+        color = self.color
+        trails = batch.trails if self.trail else None
+
+        if self.lod == STAR_LOD_CORE:
+            core_sprite = CORE_CACHE.get(
+                (color, radius_key, flicker_key),
+                lambda: build_core_sprite(color, radius)
+            )
+            half = core_sprite.get_width() // 2
+            dest = (int(self.position.x) - half, int(self.position.y) - half)
+            batch.add(core_sprite, dest)
+            if trails is not None:
+                trails.stamp(core_sprite, dest)
+            return
+
+        # Main star with glow effect
         glow_radius = radius * 2
-        glow_surface = pygame.Surface((int(glow_radius * 2), int(glow_radius * 2)), pygame.SRCALPHA)
-        
-        # Inner glow
-        for i in range(3):
-            current_radius = glow_radius * (1 - i * 0.2)
-            alpha = int(100 * (1 - i * 0.3))//2
-            glow_color = (*self.color[:3], alpha)
-            pygame.draw.circle(glow_surface, glow_color,
-                             (int(glow_radius), int(glow_radius)), 
-                             max(1, int(current_radius)))
-
-        # Core star
-        pygame.draw.circle(glow_surface, self.color,
-                         (int(glow_radius), int(glow_radius)), 
-                         max(1, int(radius)))
-        
-        # Blend onto main surface
-        surface.blit(glow_surface, 
-                    (int(self.position.x - glow_radius),
-                     int(self.position.y - glow_radius)))
+        dest = (int(self.position.x - glow_radius), int(self.position.y - glow_radius))
+        if batch.additive_glow:
+            light = GLOW_LIGHT_CACHE.get(
+                (color, radius_key, flicker_key),
+                lambda: to_light_sprite(build_glow_sprite(color, radius))
+            )
+            batch.add(light, dest, None, pygame.BLEND_RGB_ADD)
+            if trails is not None:
+                trails.stamp(light, dest, pygame.BLEND_RGB_MAX)
+            return
+        glow_sprite = GLOW_CACHE.get(
+            (color, radius_key, flicker_key),
+            lambda: build_glow_sprite(color, radius)
+        )
+        batch.add(glow_sprite, dest)
+        if trails is not None:
+            trails.stamp(glow_sprite, dest)
@@ -0,0 +1,279 @@
+# starfield.py
+
+import numpy as np
+import pygame
+from constants import *
+from star import STAR_LOD_GLOW, STAR_LOD_CORE, STAR_LOD_POINT
+from sprite_batch import SpriteBatch
+from render_backend import ScaledCanvas
+
+def plot_points(surface, xs, ys, colors):
+    """
+    Writes single-pixel points into `surface` with one vectorized surfarray assignment.
+
+    Args:
+        surface (pygame.Surface): 24/32-bit target surface (alpha is set to opaque on SRCALPHA surfaces).
+        xs, ys (np.ndarray): Screen coordinates (float or int).
+        colors (np.ndarray): (N, 3) uint8 RGB colors.
+    """
+    if len(xs) == 0:
+        return
+    width, height = surface.get_size()
+    scale = getattr(surface, "render_scale", 1.0)  # ScaledCanvas takes world coordinates
+    if scale != 1.0:
+        xs = xs * scale
+        ys = ys * scale
+    x = xs.astype(np.intp)
+    y = ys.astype(np.intp)
+    visible = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    x = x[visible]
+    y = y[visible]
+    if not len(x):
+        return
+    pixels = pygame.surfarray.pixels3d(surface)
+    pixels[x, y] = colors[visible]
+    del pixels  # Unlock the surface before anything else blits to it
+    if surface.get_flags() & pygame.SRCALPHA:
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[x, y] = 255
+        del alpha
+    # Canvases that mirror their pixels into a renderer need to know what changed
+    touch = getattr(surface, "touch", None)
+    if touch is not None:
+        left, top = int(x.min()), int(y.min())
+        touch(pygame.Rect(left, top, int(x.max()) - left + 1, int(y.max()) - top + 1))
+
+class ParallaxLayer:
+    """
+    A cached, screen-sized image of every star inside one depth band.
+
+    Stars in a far band all move by nearly the same parallax offset, so instead
+    of redrawing them the layer is baked once and blitted (wrap-tiled) at the
+    band's current offset. The layer is re-baked only when a star enters or
+    leaves the band, or when any member drifts more than `tolerance` pixels
+    from where the shared offset would put it (differing parallax, edge wraps).
+
+    Drawn onto a ScaledCanvas, the layer is baked at the canvas resolution
+    (a ScaledCanvas itself) and blitted as is: downscaling a baked layer
+    would drop most single-pixel stars.
+    """
+
+    def __init__(self, min_depth, max_depth, size, tolerance=1.0, render_scale=1.0):
+        """
+        Args:
+            min_depth (float): Inclusive lower depth bound of the band.
+            max_depth (float): Exclusive upper depth bound (inclusive for the last band).
+            size (tuple): Layer size in world pixels, normally the frame size.
+            tolerance (float): Maximum per-star drift in pixels before re-baking.
+            render_scale (float): Render scale of the canvas the layer is drawn on.
+        """
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.tolerance = tolerance
+        self.size = size
+        self.render_scale = render_scale
+        self.surface = self._new_surface()
+        self.stars = []
+        self.members = []
+        self.baked_x = np.empty(0)
+        self.baked_y = np.empty(0)
+        self.offset = (0, 0)
+        self.bakes = 0
+        self.member_rects = []  # Bake-time rect of every star in the layer
+        self._batch = SpriteBatch()
+
+    def update(self):
+        """Re-bakes or re-offsets the layer from the stars assigned to it this frame."""
+        stars = self.stars
+        count = len(stars)
+        xs = np.fromiter((star.position.x for star in stars), dtype=np.float64, count=count)
+        ys = np.fromiter((star.position.y for star in stars), dtype=np.float64, count=count)
+
+        if count and stars == self.members:
+            dx = xs - self.baked_x
+            dy = ys - self.baked_y
+            offset_x = float(np.median(dx))
+            offset_y = float(np.median(dy))
+            drift = max(np.abs(dx - offset_x).max(), np.abs(dy - offset_y).max())
+            if drift <= self.tolerance:
+                self.offset = (int(round(offset_x)), int(round(offset_y)))
+                return
+
+        self._bake(xs, ys)
+
+    def _new_surface(self):
+        if self.render_scale != 1.0:
+            return ScaledCanvas(self.size, self.render_scale)  # Stars bake in world coordinates
+        return pygame.Surface(self.size)
+
+    def _bake(self, xs, ys):
+        stars = self.stars
+        # Each bake gets a fresh surface: writing pixels into an RLE-encoded surface
+        # crashes SDL, and texture backends cache one upload per surface object
+        surface = self.surface = self._new_surface()
+        # Sprite-tier stars are blitted, point-tier stars go in one surfarray write
+        points = []
+        batch = self._batch
+        member_rects = []
+        for i, star in enumerate(stars):
+            if star.lod == STAR_LOD_POINT:
+                points.append(i)
+            else:
+                star.emit(batch)
+        batch.flush(surface, member_rects)
+        if points:
+            index = np.array(points, dtype=np.intp)
+            colors = np.array([stars[i].color for i in points], dtype=np.uint8)
+            plot_points(surface, xs[index], ys[index], colors)
+            member_rects.extend(pygame.Rect(int(xs[i]), int(ys[i]), 1, 1) for i in points)
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+
+        self.members = list(stars)
+        self.member_rects = member_rects
+        self.baked_x = xs
+        self.baked_y = ys
+        self.offset = (0, 0)
+        self.bakes += 1
+
+    def draw(self, surface, rects=None):
+        """
+        Blits the layer at its parallax offset, tiling across the wrap-around edges.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            rects (list, optional): Receives the on-screen rect of every star in the
+                layer (not the whole layer) for dirty-rect presentation.
+        """
+        if not self.members:
+            return
+        scale = self.render_scale
+        width, height = self.surface.get_size()
+        offset_x = int(round(self.offset[0] * scale)) % width
+        offset_y = int(round(self.offset[1] * scale)) % height
+        tiles = [(self.surface, (offset_x, offset_y))]
+        if offset_x:
+            tiles.append((self.surface, (offset_x - width, offset_y)))
+        if offset_y:
+            tiles.append((self.surface, (offset_x, offset_y - height)))
+        if offset_x and offset_y:
+            tiles.append((self.surface, (offset_x - width, offset_y - height)))
+        if scale != 1.0:
+            # Already at the canvas resolution: bypass ScaledCanvas.blits and its downscale
+            pygame.Surface.blits(surface, tiles, doreturn=False)
+        else:
+            surface.blits(tiles, doreturn=False)
+
+        if rects is not None:
+            for rect in self.member_rects:
+                moved = pygame.Rect((rect.x + offset_x) % width, (rect.y + offset_y) % height, rect.w, rect.h)
+                rects.append(moved)
+                if moved.right > width or moved.bottom > height:
+                    rects.append(moved.move(-width if moved.right > width else 0,
+                                            -height if moved.bottom > height else 0))
+
+class StarFieldRenderer:
+    """
+    Depth-based level of detail for the star field.
+
+    Each frame `partition` tags every star with a LOD tier:
+    - depth < glow_depth:  full cached glow sprite (Star.emit)
+    - depth < point_depth: cached core sprite only, no glow
+    - otherwise:           one pixel, plotted for all such stars at once by `draw_far`
+
+    Stars at or beyond `background_depth` are additionally routed into cached
+    ParallaxLayer bands, so a whole band costs one blit instead of N draws.
+    """
+
+    def __init__(self, glow_depth=STAR_LOD_GLOW_DEPTH, point_depth=STAR_LOD_POINT_DEPTH,
+                 background_depth=STAR_BACKGROUND_DEPTH, background_bands=STAR_BACKGROUND_BANDS,
+                 size=(WIDTH, HEIGHT), render_scale=1.0):
+        """
+        Args:
+            glow_depth (float): Stars shallower than this get the glow sprite.
+            point_depth (float): Stars at or beyond this depth are drawn as points.
+            background_depth (float or None): Depth where the cached far-field layers
+                start; None disables them.
+            background_bands (int): Number of equal depth bands up to MAX_DEPTH.
+            size (tuple): Frame size the layers are allocated at.
+            render_scale (float): Render scale of the scene the layers are drawn on
+                (ScaledCanvas.render_scale), so they bake at its resolution.
+        """
+        self.glow_depth = glow_depth
+        self.point_depth = point_depth
+        self.near_stars = []  # Sprite-path stars from the last partition
+        self.far_stars = []
+        self.layers = []
+        self.background_depth = background_depth
+        if background_depth is not None and background_bands > 0:
+            step = (MAX_DEPTH - background_depth) / background_bands
+            self.layers = [
+                ParallaxLayer(background_depth + i * step, background_depth + (i + 1) * step, size,
+                              render_scale=render_scale)
+                for i in range(background_bands)
+            ]
+
+    def partition(self, stars, keep=None):
+        """
+        Assigns LOD tiers and splits off the point-rendered stars. Stars that still
+        need to be drawn through the sprite batch get `star.batched` set and are
+        listed in `near_stars`; point stars go to `far_stars`.
+
+        Args:
+            stars (list): All stars.
+            keep (Star, optional): A star that must stay on the sprite path (e.g. the target).
+        """
+        glow_depth = self.glow_depth
+        point_depth = self.point_depth
+        background_depth = self.background_depth
+        if background_depth is None:
+            background_depth = float('inf')
+        layers = self.layers
+        for layer in layers:
+            layer.stars.clear()
+        near = self.near_stars
+        near.clear()
+        far = self.far_stars
+        far.clear()
+        for star in stars:
+            depth = star.depth
+            star.batched = False
+            if depth >= background_depth and star is not keep:
+                star.lod = (STAR_LOD_GLOW if depth < glow_depth else
+                            STAR_LOD_CORE if depth < point_depth else STAR_LOD_POINT)
+                for layer in layers:
+                    if depth < layer.max_depth or layer is layers[-1]:
+                        layer.stars.append(star)
+                        break
+            elif depth < glow_depth:
+                star.lod = STAR_LOD_GLOW
+                star.batched = True
+                near.append(star)
+            elif depth < point_depth or star is keep:
+                star.lod = STAR_LOD_CORE
+                star.batched = True
+                near.append(star)
+            else:
+                star.lod = STAR_LOD_POINT
+                far.append(star)
+
+    def draw_far(self, surface, rects=None):
+        """
+        Draws the cached background bands (deepest first), then plots every remaining
+        point-LOD star from the last partition in a single surfarray write.
+
+        Args:
+            surface (pygame.Surface): Target surface.
+            rects (list, optional): Receives the rects touched, for dirty-rect presentation.
+        """
+        for layer in reversed(self.layers):
+            layer.update()
+            layer.draw(surface, rects)
+        far = self.far_stars
+        if not far:
+            return
+        xs = np.fromiter((star.position.x for star in far), dtype=np.float64, count=len(far))
+        ys = np.fromiter((star.position.y for star in far), dtype=np.float64, count=len(far))
+        colors = np.array([star.color for star in far], dtype=np.uint8)
+        plot_points(surface, xs, ys, colors)
+        if rects is not None:
+            rects.extend(pygame.Rect(int(x), int(y), 1, 1) for x, y in zip(xs.tolist(), ys.tolist()))
@@ -0,0 +1,125 @@
+# tile_render.py
+
+from concurrent.futures import ThreadPoolExecutor
+from constants import *
+from sprite_cache import surface_bytes
+
+TILE_SPRITE_LIMIT = 4096  # Sprite copies kept per tile before it starts over
+TILE_SPRITE_BYTES = 16 * 1024 * 1024  # Pixel bytes of copies kept per tile before it starts over
+
+class RenderTile:
+    """
+    One horizontal band of the frame: a subsurface of the target plus the
+    tile's own copies of every sprite drawn into it.
+
+    SDL keeps per-source blit state (the blit map and its destination info), so
+    two threads blitting the same source surface at once would race. Each tile
+    therefore blits from private copies, made on first use and cached by
+    source. The copies are what tiling costs in memory (up to one per tile for
+    a sprite drawn all over the frame), so each tile keeps at most
+    TILE_SPRITE_LIMIT of them or TILE_SPRITE_BYTES of pixels before starting over.
+    """
+
+    def __init__(self, target, top, bottom):
+        self.top = top
+        self.bottom = bottom
+        self.surface = target.subsurface((0, top, target.get_width(), bottom - top))
+        self.sprites = {}  # id(source) -> (source, copy); the source ref keeps the id valid
+        self.sprite_bytes = 0  # Pixel bytes of the copies in `sprites`
+        self.blits = []    # This frame's blit list, in tile coordinates
+
+    def sprite(self, source):
+        """Returns this tile's copy of `source`."""
+        entry = self.sprites.get(id(source))
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        if len(self.sprites) >= TILE_SPRITE_LIMIT or self.sprite_bytes >= TILE_SPRITE_BYTES:
+            self.sprites.clear()
+            self.sprite_bytes = 0
+        copy = source.copy()
+        self.sprites[id(source)] = (source, copy)
+        self.sprite_bytes += surface_bytes(copy)
+        return copy
+
+    def draw(self, doreturn):
+        """Blits this tile's list in order (runs on a worker thread)."""
+        blits = self.blits
+        if not blits:
+            return []
+        rects = self.surface.blits(blits, doreturn)
+        blits.clear()
+        return rects or []
+
+class TileRenderer:
+    """
+    Draws sprite batches by splitting the target into horizontal tiles and
+    blitting each tile's share on a thread pool.
+
+    pygame releases the GIL inside blits, so tiles rasterize on separate cores.
+    Every blit goes to each tile it overlaps, in submission order, so painter's
+    ordering holds within every tile and therefore across the frame. Only the
+    partition into tiles runs on the calling thread.
+    """
+
+    def __init__(self, target, tiles=RENDER_THREADS, workers=None):
+        """
+        Args:
+            target (pygame.Surface): Surface to draw on (the display surface).
+            tiles (int): Number of horizontal tiles.
+            workers (int, optional): Worker threads; defaults to one per tile.
+        """
+        height = target.get_height()
+        self.tile_height = -(-height // tiles)
+        self.tiles = [RenderTile(target, top, min(top + self.tile_height, height))
+                      for top in range(0, height, self.tile_height)]
+        self.executor = ThreadPoolExecutor(max_workers=workers or len(self.tiles), thread_name_prefix="render-tile")
+
+    def flush(self, batch, rects=None):
+        """
+        Draws every sprite queued in `batch` and empties it, like SpriteBatch.flush.
+
+        Args:
+            batch (SpriteBatch): Batch to draw.
+            rects (list, optional): When given, the screen rect of every tile blit is appended.
+        """
+        sprites = batch.sprites
+        if not sprites:
+            return
+        tiles = self.tiles
+        tile_height = self.tile_height
+        last_tile = len(tiles) - 1
+        for item in sprites:
+            source = item[0]
+            x, y = item[1]
+            y = int(y)
+            if len(item) > 2 and item[2] is not None:
+                height = item[2][3]
+            else:
+                height = source.get_height()
+            first = y // tile_height
+            last = (y + height - 1) // tile_height
+            if first == last and 0 <= first <= last_tile:
+                # Common case: the sprite lies inside one tile
+                tile = tiles[first]
+                entry = tile.sprites.get(id(source))
+                copy = entry[1] if entry is not None and entry[0] is source else tile.sprite(source)
+                tile.blits.append((copy, (x, y - tile.top)) + item[2:])
+                continue
+            for index in range(max(0, first), min(last_tile, last) + 1):
+                tile = tiles[index]
+                tile.blits.append((tile.sprite(source), (x, y - tile.top)) + item[2:])
+        sprites.clear()
+
+        doreturn = rects is not None
+        futures = [(tile, self.executor.submit(tile.draw, doreturn)) for tile in tiles if tile.blits]
+        for tile, future in futures:
+            drawn = future.result()
+            if doreturn:
+                rects.extend(rect.move(0, tile.top) for rect in drawn)
+
+    def shutdown(self):
+        """Stops the worker threads and drops the tiles' sprite copies."""
+        self.executor.shutdown()
+        for tile in self.tiles:
+            tile.sprites.clear()
+            tile.sprite_bytes = 0
@@ -0,0 +1,99 @@
+# timestep.py
+
+from constants import *
+
+class FixedTimestep:
+    """
+    Accumulator that turns variable frame times into whole simulation steps of
+    a fixed length.
+
+    Each frame `advance` adds the elapsed time and returns how many steps to
+    run; the remainder carries over, and `alpha` is how far the frame sits
+    between the last two simulation states (0..1), for interpolation. After a
+    hitch at most `max_steps` are run and the rest of the backlog is dropped,
+    so a long stall slows the game down instead of freezing it in catch-up.
+    """
+
+    def __init__(self, rate=SIMULATION_RATE, max_steps=MAX_SIMULATION_STEPS):
+        """
+        Args:
+            rate (float): Simulation steps per second.
+            max_steps (int): Most steps run for one frame.
+        """
+        self.dt = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """
+        Adds `frame_time` seconds and returns the number of steps due.
+
+        Args:
+            frame_time (float): Seconds since the previous frame.
+        """
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = self.dt * steps
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a step elapsed since the last simulation state."""
+        return min(1.0, self.accumulator / self.dt)
+
+class StateInterpolator:
+    """
+    Blends drawn positions and depths between the previous and the current
+    simulation step.
+
+    `save` records each object's state before a step; `apply` moves the
+    objects to the blended state for drawing and `restore` puts the simulated
+    state back. Objects that wrapped around the screen or the depth range
+    during the step (a jump larger than half the range) are drawn at their
+    current state rather than swept across.
+    """
+
+    def __init__(self):
+        self.applied = []  # (object, x, y, depth) of the simulated state while blended
+
+    def save(self, objects):
+        """Records the pre-step state of `objects`."""
+        for obj in objects:
+            obj.previous_state = (obj.position.x, obj.position.y, obj.depth)
+
+    def apply(self, objects, alpha):
+        """
+        Moves `objects` to their blended state; call `restore` after drawing.
+
+        Args:
+            objects (iterable): Objects with `position` and `depth`.
+            alpha (float): 0 draws the previous step, 1 the current one.
+        """
+        if alpha >= 1.0:
+            return
+        applied = self.applied
+        half_width, half_height, half_depth = WIDTH / 2, HEIGHT / 2, (MAX_DEPTH - MIN_DEPTH) / 2
+        for obj in objects:
+            previous = getattr(obj, 'previous_state', None)
+            if previous is None:
+                continue  # Spawned during the last step
+            position = obj.position
+            x, y, depth = position.x, position.y, obj.depth
+            px, py, pdepth = previous
+            if abs(x - px) > half_width or abs(y - py) > half_height or abs(depth - pdepth) > half_depth:
+                continue  # Wrapped
+            applied.append((obj, x, y, depth))
+            position.x = px + (x - px) * alpha
+            position.y = py + (y - py) * alpha
+            obj.depth = pdepth + (depth - pdepth) * alpha
+
+    def restore(self):
+        """Puts back the simulated state of every object moved by `apply`."""
+        for obj, x, y, depth in self.applied:
+            obj.position.x = x
+            obj.position.y = y
+            obj.depth = depth
+        self.applied.clear()
@@ -0,0 +1,117 @@
+# trails.py
+
+from collections import deque
+import pygame
+from constants import *
+from render_backend import ScaledCanvas
+
+TRAIL_FADE = 0.8  # Share of a trail's brightness kept from one frame to the next
+
+class TrailBuffer:
+    """
+    Persistent accumulation surface for motion trails.
+
+    Objects that opt in `stamp` the sprite they draw this frame into the
+    buffer. Every frame the buffer is faded with one BLEND_RGB_MULT blit of a
+    constant surface (plus a BLEND_RGB_SUB of 1, since the multiply alone never
+    reaches zero; blend blits are SIMD, blend fills are not) and added onto the
+    scene behind the world layer, so a trail costs the same whatever its
+    length: one fade, one composite and one stamp per object.
+
+    Only the area stamped during the frames a trail takes to fade out is faded
+    and composited.
+    """
+
+    def __init__(self, target, size=(WIDTH, HEIGHT), fade=TRAIL_FADE):
+        """
+        Args:
+            target (pygame.Surface): Scene the trails are composited onto; a
+                ScaledCanvas gets a buffer at its render scale.
+            size (tuple): World (screen) size.
+            fade (float): Brightness kept per frame, 0..1.
+        """
+        self.render_scale = getattr(target, "render_scale", 1.0)
+        if self.render_scale != 1.0:
+            self.surface = ScaledCanvas(size, self.render_scale)  # Stamps stay in world coordinates
+        else:
+            self.surface = pygame.Surface(size)
+        # Constant fade operands, as large as the buffer
+        self.multiply = pygame.Surface(self.surface.get_size())
+        self.multiply.fill((int(fade * 255),) * 3)
+        self.floor = pygame.Surface(self.surface.get_size())
+        self.floor.fill((1, 1, 1))
+        self.stamps = []
+        self.regions = deque(maxlen=self._lifetime())  # Stamped rect of each recent frame, buffer pixels
+
+    def _lifetime(self):
+        # Frames a full-brightness pixel survives the fade, found by running it
+        pixel = pygame.Surface((1, 1))
+        pixel.fill((255, 255, 255))
+        frames = 0
+        while pixel.get_at((0, 0))[0] and frames < 255:
+            self._fade(pixel, pixel.get_rect())
+            frames += 1
+        return frames + 1
+
+    def _fade(self, surface, rect):
+        pygame.Surface.blit(surface, self.multiply, rect.topleft, rect, pygame.BLEND_RGB_MULT)
+        pygame.Surface.blit(surface, self.floor, rect.topleft, rect, pygame.BLEND_RGB_SUB)
+
+    def stamp(self, sprite, dest, special_flags=0):
+        """
+        Queues `sprite` for the buffer; it shows as trail from the next frame on.
+
+        Args:
+            sprite (pygame.Surface): The sprite the object draws this frame.
+            dest (tuple): Its top-left position in world coordinates.
+            special_flags (int): pygame blend flags, e.g. BLEND_RGB_MAX for opaque
+                light sprites whose black background must not cover older trail.
+        """
+        if special_flags:
+            self.stamps.append((sprite, dest, None, special_flags))
+        else:
+            self.stamps.append((sprite, dest))
+
+    def region(self):
+        """Returns the buffer area that may still hold trail, or None."""
+        regions = [rect for rect in self.regions if rect is not None]
+        if not regions:
+            return None
+        return regions[0].unionall(regions[1:])
+
+    def composite(self, target):
+        """
+        Fades the buffer and adds it onto `target` (the scene, before the world layer).
+
+        Returns:
+            pygame.Rect or None: Area drawn, in world coordinates.
+        """
+        region = self.region()
+        if region is None:
+            return None
+        region = region.clip(self.surface.get_rect())
+        if not (region.w and region.h):
+            return None
+        self._fade(self.surface, region)
+        if self.render_scale != 1.0:
+            pygame.Surface.blit(target, self.surface, region.topleft, region, pygame.BLEND_RGB_ADD)
+            scale = self.render_scale
+            return pygame.Rect(int(region.x / scale), int(region.y / scale),
+                               int(region.w / scale) + 1, int(region.h / scale) + 1)
+        # A fresh subsurface per frame: texture canvases cache uploads per source surface
+        return target.blit(self.surface.subsurface(region), region.topleft, None, pygame.BLEND_RGB_ADD)
+
+    def flush(self):
+        """Draws this frame's stamps into the buffer."""
+        if self.stamps:
+            rects = self.surface.blits(self.stamps)
+            self.stamps.clear()
+            self.regions.append(rects[0].unionall(rects[1:]))
+        else:
+            self.regions.append(None)
+
+    def clear(self):
+        """Erases every trail."""
+        self.surface.fill((0, 0, 0))
+        self.stamps.clear()
+        self.regions.clear()
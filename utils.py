@@ -1,6 +1,17 @@
 import pygame
 from constants import *
 
+class PressedKeys:
+    """Scripted key state, indexed by pygame key codes like pygame.key.get_pressed()."""
+
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+KEY_STATE_TYPES = (PressedKeys, pygame.key.ScancodeWrapper)  # Indexable key states; anything else is a collection of key codes
+
 def get_direction(keys_pressed, BASE_DIRECTION_MAP):
     dx = keys_pressed[pygame.K_d] - keys_pressed[pygame.K_a]
     dy = keys_pressed[pygame.K_s] - keys_pressed[pygame.K_w]
@@ -20,5 +31,5 @@ def draw_box(surface, position, size, color, thickness=2):
         ((x + half_size, y + half_size), (x + half_size - quarter_size, y + half_size)),
         ((x + half_size, y + half_size), (x + half_size, y + half_size - quarter_size)),
     ]
-    for start_pos, end_pos in lines:
-        pygame.draw.line(surface, color, start_pos, end_pos, thickness)
+    rects = [pygame.draw.line(surface, color, start_pos, end_pos, thickness) for start_pos, end_pos in lines]
+    return rects[0].unionall(rects[1:])